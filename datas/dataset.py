@@ -1,7 +1,10 @@
 import os
+import io
 import random
+import tarfile
 
 import json
+import numpy as np
 import torch
 from torch.utils.data import Dataset
 
@@ -28,18 +31,51 @@ class StableDataset(Dataset):
         with open(filelist_path, 'r', encoding='utf-8') as f:
             for line in f:
                 line = json.loads(line.strip())
-                filelist.append((line['mel_path'], line['phone']))
+                if 'mel_shard' in line:
+                    # sharded layout written by the khmer preprocess script
+                    mel_ref = (line['mel_shard'], line['mel_key'])
+                else:
+                    mel_ref = line['mel_path']
+                filelist.append((mel_ref, line['phone']))
                 lengths.append(line['mel_length'])
-            
+
         self.filelist = filelist
         self.lengths = lengths # length is used for DistributedBucketSampler
-    
+        self._tars = {} # per-process tarfile handles, keyed by shard path
+        self._tars_pid = os.getpid()
+
+    def _load_mel_from_shard(self, shard_path, mel_key):
+        # reopen handles after fork: DataLoader workers must not share the
+        # parent's tarfile offsets
+        if os.getpid() != self._tars_pid:
+            self._tars = {}
+            self._tars_pid = os.getpid()
+        tar = self._tars.get(shard_path)
+        if tar is None:
+            tar = tarfile.open(shard_path, 'r')
+            self._tars[shard_path] = tar
+        try:
+            member = tar.extractfile(f'{mel_key}.mel.npy')
+        except KeyError:
+            # older shards carry torch-serialized members
+            member = tar.extractfile(f'{mel_key}.mel.pt')
+            return torch.load(io.BytesIO(member.read()), map_location='cpu', weights_only=True)
+        return torch.from_numpy(np.load(io.BytesIO(member.read())))
+
     def __len__(self):
         return len(self.filelist)
 
     def __getitem__(self, idx):
-        mel_path, phone = self.filelist[idx]
-        mel = torch.load(mel_path, map_location='cpu', weights_only=True)
+        mel_ref, phone = self.filelist[idx]
+        if isinstance(mel_ref, tuple):
+            mel = self._load_mel_from_shard(*mel_ref)
+        elif mel_ref.endswith('.npy'):
+            # copy-on-write mmap: pages stream in on demand and are shared
+            # between dataloader workers through the page cache
+            mel = torch.from_numpy(np.load(mel_ref, mmap_mode='c'))
+        else:
+            # older filelists point at torch-serialized mels
+            mel = torch.load(mel_ref, map_location='cpu', weights_only=True)
         phone = torch.tensor(intersperse(cleaned_text_to_sequence(phone), 0), dtype=torch.long)
         return mel, phone
     
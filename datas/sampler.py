@@ -0,0 +1,49 @@
+import random
+
+from torch.utils.data import Sampler
+
+class LengthBucketSampler(Sampler):
+    """
+    Batch sampler that groups utterances of similar mel length.
+
+    Indices are sorted by length, shuffled inside super-batches of
+    bucket_size * batch_size, and the resulting batches are shuffled per
+    epoch. Each batch then pads to a max length close to its own mean, so
+    far fewer pad frames go through the STFT/attention kernels than with
+    uniform shuffling, while batch composition still varies across epochs.
+
+    Lengths come from the filelist (mel_length), so no audio is scanned.
+    """
+    def __init__(self, lengths, batch_size, bucket_size=100, drop_last=True, seed=0):
+        self.lengths = lengths
+        self.batch_size = batch_size
+        self.super_size = bucket_size * batch_size
+        self.drop_last = drop_last
+        self.seed = seed
+        self.epoch = 0
+
+    def set_epoch(self, epoch):
+        self.epoch = epoch
+
+    def __iter__(self):
+        rng = random.Random(self.seed + self.epoch)
+        order = sorted(range(len(self.lengths)), key=self.lengths.__getitem__)
+        batches = []
+        for start in range(0, len(order), self.super_size):
+            chunk = order[start:start + self.super_size]
+            rng.shuffle(chunk)
+            for i in range(0, len(chunk), self.batch_size):
+                batch = chunk[i:i + self.batch_size]
+                if len(batch) == self.batch_size or not self.drop_last:
+                    batches.append(batch)
+        rng.shuffle(batches)
+        return iter(batches)
+
+    def __len__(self):
+        n = len(self.lengths)
+        if not self.drop_last:
+            return (n + self.batch_size - 1) // self.batch_size
+        count = 0
+        for start in range(0, n, self.super_size):
+            count += min(self.super_size, n - start) // self.batch_size
+        return count
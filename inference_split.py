@@ -1,14 +1,23 @@
 import os
 import sys
-from unittest.mock import MagicMock
-
-# Mock dependencies to avoid import errors
-sys.modules["pyopenjtalk"] = MagicMock()
-sys.modules["inflect"] = MagicMock()
-sys.modules["unidecode"] = MagicMock()
-sys.modules["eng_to_ipa"] = MagicMock()
-sys.modules["pypinyin"] = MagicMock()
-sys.modules["jieba"] = MagicMock()
+import types
+
+
+class _LazyStub:
+    """Inert placeholder returned for any attribute of a stubbed module."""
+    def __getattr__(self, name):
+        return self
+    def __call__(self, *args, **kwargs):
+        return self
+
+
+# Stub unused g2p dependencies to avoid import errors. Unlike MagicMock this
+# skips importing unittest.mock and costs nothing until an attribute is
+# actually referenced.
+for _name in ("pyopenjtalk", "inflect", "unidecode", "eng_to_ipa", "pypinyin", "jieba"):
+    _mod = types.ModuleType(_name)
+    _mod.__getattr__ = lambda attr, _stub=_LazyStub(): _stub
+    sys.modules[_name] = _mod
 
 from text.khmer import khmer_g2p
 from text.khmer_textnorm import normalize_khmer_text
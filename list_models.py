@@ -1,12 +1,17 @@
 #!/usr/bin/env python3
 """Quick script to list available Gemini models"""
+import os
+import re
+from pathlib import Path
+
 import google.generativeai as genai
 
-with open('hehe.txt', 'r') as f:
-    for line in f:
-        if 'KEY =' in line:
-            api_key = line.split('=')[1].strip().strip('"')
-            break
+api_key = os.environ.get('GEMINI_API_KEY')
+if not api_key:
+    match = re.search(r'KEY\s*=\s*"([^"]+)"', Path('hehe.txt').read_text())
+    if not match:
+        raise SystemExit('No API key: set GEMINI_API_KEY or put KEY = "..." in hehe.txt')
+    api_key = match.group(1)
 
 genai.configure(api_key=api_key)
 
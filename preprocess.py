@@ -3,6 +3,7 @@ import json
 from tqdm import tqdm
 from dataclasses import dataclass, asdict
 
+import numpy as np
 import torch
 from torch.multiprocessing import Pool, set_start_method
 import torchaudio
@@ -73,8 +74,10 @@ def process_filelist(line) -> str:
             phone = g2p(text)
             if len(phone) > 0:
                 mel = mel_extractor(audio.to(device)).cpu().squeeze(0) # shape: [n_mels, time // hop_length]
-                output_mel_path = os.path.join(output_mel_dir, f'{idx}_{audio_name}.pt')
-                torch.save(mel, output_mel_path)
+                # .npy so the dataset can memory-map the mel instead of
+                # unpickling a torch archive per item
+                output_mel_path = os.path.join(output_mel_dir, f'{idx}_{audio_name}.npy')
+                np.save(output_mel_path, mel.numpy())
                 
                 if data_config.resample:
                     audio_path = os.path.join(output_wav_dir, f'{idx}_{audio_name}.wav')
@@ -25,13 +25,20 @@ def process_dataset():
     # Ensure output dir exists
     os.makedirs(os.path.dirname(data_config.output_filelist_path), exist_ok=True)
 
-    results = []
     dataset_path = Path(data_config.dataset_path)
 
     if not Path(data_config.index_path).exists():
         raise FileNotFoundError(f"Index file not found: {data_config.index_path}")
 
-    with open(data_config.index_path, 'r', encoding='utf-8') as fh:
+    # One directory scan instead of a stat() syscall per audio file
+    try:
+        available = {entry.name for entry in os.scandir(dataset_path)}
+    except FileNotFoundError:
+        available = set()
+
+    count = 0
+    with open(data_config.index_path, 'r', encoding='utf-8') as fh, \
+         open(data_config.output_filelist_path, 'w', encoding='utf-8') as out:
         for raw in fh:
             line = raw.strip()
             if not line or line.startswith('#'):
@@ -50,16 +57,15 @@ def process_dataset():
             if not filename.lower().endswith('.wav'):
                 filename = filename + '.wav'
 
-            wav_path = dataset_path / filename
-            if not wav_path.exists():
-                print(f"Warning: file not found: {wav_path}")
+            if filename not in available:
+                print(f"Warning: file not found: {dataset_path / filename}")
                 continue
 
-            results.append(f"{wav_path.resolve().as_posix()}|{text}\n")
+            # stream entries straight to the (buffered) output file
+            out.write(f"{(dataset_path / filename).resolve().as_posix()}|{text}\n")
+            count += 1
 
-    print(f"Writing {len(results)} entries to {data_config.output_filelist_path}")
-    with open(data_config.output_filelist_path, 'w', encoding='utf-8') as f:
-        f.writelines(results)
+    print(f"Wrote {count} entries to {data_config.output_filelist_path}")
 
 
 if __name__ == '__main__':
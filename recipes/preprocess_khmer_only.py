@@ -1,10 +1,17 @@
 import os
+import io
 import json
+import tarfile
 from dataclasses import asdict
 from pathlib import Path
 
 import sys
+import functools
+
+import numpy as np
 import torch
+import torchaudio
+from torch.utils.data import Dataset, DataLoader
 from tqdm import tqdm
 
 # allow running this script from the recipes/ folder: add project root to sys.path
@@ -28,6 +35,59 @@ output_filelist_json = './filelists/khmer.json'
 device = torch.device('cuda') if torch.cuda.is_available() else torch.device('cpu')
 mel_extractor = LogMelSpectrogram(**asdict(mel_config)).to(device)
 
+batch_size = 8
+num_workers = 4
+
+# dedicated stream so host-to-device copies overlap with kernel launches
+copy_stream = torch.cuda.Stream() if device.type == 'cuda' else None
+
+# mels per .tar shard before rolling over to a new one
+shard_size = 5000
+
+
+class MelShardWriter:
+    """Append mels into sequentially written .tar shards.
+
+    One large sequential write beats tens of thousands of tiny .pt files
+    (inode + sync overhead per save), especially on network filesystems.
+    """
+
+    def __init__(self, output_dir, shard_size=shard_size):
+        self.output_dir = output_dir
+        self.shard_size = shard_size
+        self.tar = None
+        self.shard_path = None
+        self.shard_idx = -1
+        self.count = 0
+
+    def _roll(self):
+        if self.tar is not None:
+            self.tar.close()
+        self.shard_idx += 1
+        self.shard_path = os.path.join(self.output_dir, f'mels-{self.shard_idx:04d}.tar')
+        self.tar = tarfile.open(self.shard_path, 'w')
+        self.count = 0
+
+    def write(self, key, mel):
+        """Store one mel under `key`; returns the shard path it landed in."""
+        if self.tar is None or self.count >= self.shard_size:
+            self._roll()
+        # .npy is a flat header plus raw bytes; torch.save would wrap every
+        # mel in a zip archive with its own manifest overhead
+        buf = io.BytesIO()
+        np.save(buf, mel.numpy())
+        data = buf.getvalue()
+        info = tarfile.TarInfo(f'{key}.mel.npy')
+        info.size = len(data)
+        self.tar.addfile(info, io.BytesIO(data))
+        self.count += 1
+        return self.shard_path
+
+    def close(self):
+        if self.tar is not None:
+            self.tar.close()
+            self.tar = None
+
 def load_filelist(path):
     entries = []
     with open(path, 'r', encoding='utf-8') as f:
@@ -40,52 +100,145 @@ def load_filelist(path):
     return entries
 
 
-def process_all(max_items=None):
-    entries = load_filelist(input_filelist)
-    if max_items is not None:
-        entries = entries[:max_items]
-    results = []
+# Resample modules cached per input sample rate so the FIR taps are computed
+# once per (sr, target_sr) pair instead of per file
+_RESAMPLERS = {}
+
+
+def _resample(audio, sr):
+    resampler = _RESAMPLERS.get(sr)
+    if resampler is None:
+        resampler = torchaudio.transforms.Resample(sr, mel_config.sample_rate)
+        _RESAMPLERS[sr] = resampler
+    return resampler(audio)
+
 
-    for idx, audio_path, text in tqdm(entries, total=len(entries)):
-        # load audio (try torchaudio, fall back to soundfile)
+@functools.lru_cache(maxsize=None)
+def _info(audio_path):
+    """Cached header read (num_frames, sample_rate, ...) — a few KB instead of
+    a full decode, so broken or empty files are rejected cheaply."""
+    return torchaudio.info(audio_path)
+
+
+def load_audio(audio_path):
+    """Load one waveform at the target sample rate, or None on failure."""
+    # load audio (try torchaudio, fall back to soundfile)
+    try:
+        audio = load_and_resample_audio(audio_path, mel_config.sample_rate)
+    except Exception:
+        audio = None
+    if audio is None:
         try:
-            audio = load_and_resample_audio(audio_path, mel_config.sample_rate)
-        except Exception:
+            import soundfile as sf
+            import numpy as np
+            data, sr = sf.read(audio_path, dtype='float32')
+            if data.ndim > 1:
+                data = data.mean(axis=1)
+            data = np.expand_dims(data, 0)
+            audio = torch.from_numpy(data)
+            if sr != mel_config.sample_rate:
+                # polyphase resample; far faster and alias-free compared to
+                # the old F.interpolate on the raw waveform
+                audio = _resample(audio, sr)
+        except Exception as e:
+            print(f"Failed to load {audio_path}: {e}")
             audio = None
-        if audio is None:
-            try:
-                import soundfile as sf
-                import numpy as np
-                data, sr = sf.read(audio_path, dtype='float32')
-                if data.ndim > 1:
-                    data = data.mean(axis=1)
-                data = np.expand_dims(data, 0)
-                audio = torch.from_numpy(data)
-                if sr != mel_config.sample_rate:
-                    # simple resample via torchaudio if available
-                    try:
-                        audio = torch.nn.functional.interpolate(audio.unsqueeze(0), size=int(audio.size(1) * mel_config.sample_rate / sr)).squeeze(0)
-                    except Exception:
-                        pass
-            except Exception as e:
-                print(f"Failed to load {audio_path}: {e}")
-                audio = None
+    return audio
+
+
+class KhmerDataset(Dataset):
+    """Runs audio decoding and g2p on DataLoader workers so the GPU mel
+    extraction in the main process never waits on CPU-bound work."""
+
+    def __init__(self, entries):
+        self.entries = entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, i):
+        idx, audio_path, text = self.entries[i]
+        # reject unreadable/empty files from the header alone before paying
+        # for a full decode (and a second decode in the soundfile fallback)
+        try:
+            if _info(audio_path).num_frames == 0:
+                print(f"Warning: empty audio file {audio_path}")
+                return None
+        except Exception:
+            print(f"Warning: unreadable audio file {audio_path}")
+            return None
+
+        audio = load_audio(audio_path)
         if audio is None:
             print(f"Failed to load {audio_path}")
-            continue
+            return None
 
         # g2p using khmer lexicon
         phones = khmer_g2p(text)
         if len(phones) == 0:
             print(f"Warning: empty phones for {audio_path}")
+            return None
+
+        return idx, audio.squeeze(0), phones, audio_path, text
+
+
+def pad_collate(batch):
+    """Pad waveforms to the max length in the batch, tracking real lengths.
+
+    Items that failed to load are dropped here.
+    """
+    batch = [item for item in batch if item is not None]
+    if not batch:
+        return None
+    idxs, audios, phones, audio_paths, texts = zip(*batch)
+    lengths = torch.tensor([audio.size(-1) for audio in audios], dtype=torch.long)
+    wavs = torch.zeros(len(audios), int(lengths.max()))
+    for i, audio in enumerate(audios):
+        wavs[i, :audio.size(-1)] = audio
+    return list(idxs), wavs, lengths, list(phones), list(audio_paths), list(texts)
+
+
+def mel_frames(num_samples: int) -> int:
+    """Number of mel frames produced for a waveform of `num_samples`."""
+    return (num_samples + 2 * mel_config.pad - mel_config.n_fft) // mel_config.hop_length + 1
+
+
+def process_all(max_items=None):
+    entries = load_filelist(input_filelist)
+    if max_items is not None:
+        entries = entries[:max_items]
+    results = []
+
+    loader = DataLoader(KhmerDataset(entries), batch_size=batch_size, shuffle=False,
+                        num_workers=num_workers, pin_memory=True, collate_fn=pad_collate)
+
+    shard_writer = MelShardWriter(output_mel_dir)
+
+    for batch in tqdm(loader, total=len(loader)):
+        if batch is None:
             continue
+        idxs, wavs, lengths, phones_list, audio_paths, texts = batch
+
+        # batched mel extraction on GPU; each mel is cut back to its real length.
+        # The waveforms come out of the DataLoader pinned, so the copy below is
+        # truly asynchronous; .cpu() is the single sync point per batch.
+        if copy_stream is not None:
+            with torch.cuda.stream(copy_stream):
+                wavs = wavs.to(device, non_blocking=True)
+            torch.cuda.current_stream().wait_stream(copy_stream)
+            wavs.record_stream(torch.cuda.current_stream())
+        else:
+            wavs = wavs.to(device)
+        mels = mel_extractor(wavs).cpu()
+
+        for i, idx in enumerate(idxs):
+            mel = mels[i, :, :mel_frames(int(lengths[i]))]
+            mel_key = f"{idx}_{Path(audio_paths[i]).stem}"
+            shard_path = shard_writer.write(mel_key, mel)
 
-        # mel
-        mel = mel_extractor(audio.to(device)).cpu().squeeze(0)
-        output_mel_path = os.path.join(output_mel_dir, f"{idx}_{Path(audio_path).stem}.pt")
-        torch.save(mel, output_mel_path)
+            results.append({'mel_shard': shard_path, 'mel_key': mel_key, 'phone': phones_list[i], 'audio_path': audio_paths[i], 'text': texts[i], 'mel_length': mel.size(-1)})
 
-        results.append({'mel_path': output_mel_path, 'phone': phones, 'audio_path': audio_path, 'text': text, 'mel_length': mel.size(-1)})
+    shard_writer.close()
 
     # write jsonl
     with open(output_filelist_json, 'w', encoding='utf-8') as f:
@@ -1,10 +1,16 @@
 import re
 import os
+import mmap
+import pickle
 from pathlib import Path
 from typing import List, Dict, Union
 from text.khmer_textnorm import normalize_khmer_text
 from text.khmer_word_segmentation import segment_khmer_text
 
+# precompiled once: whitespace collapsing runs on every g2p call
+_WS_RE = re.compile(r"\s+")
+
+
 def _default_lexicon_path() -> str:
     # default location inside the repo: text/lexicons/khmer.tsv
     return str(Path(__file__).resolve().parent.joinpath('lexicons', 'khmer.tsv'))
@@ -18,26 +24,49 @@ def load_lexicon(path: str = None) -> Dict[str, List[str]]:
         p = Path(path)
         if not p.exists():
             return lex
-        with p.open('r', encoding='utf-8') as f:
-            for raw in f:
-                line = raw.strip()
-                if not line or line.startswith('#'):
-                    continue
-                parts = line.split('\t')
-                if len(parts) < 2:
-                    continue
-                key = parts[0].strip()
-                phones = parts[1].strip().split()
-                if key:
-                    lex[key] = phones
+        # Deserializing a pickled dict is much faster than re-parsing the TSV,
+        # which matters because the lexicon is loaded at import time by every
+        # entry script. The cache is invalidated whenever the TSV is newer.
+        cache = p.with_suffix(p.suffix + '.pkl')
+        try:
+            if cache.exists() and cache.stat().st_mtime >= p.stat().st_mtime:
+                return pickle.loads(cache.read_bytes())
+        except Exception:
+            pass
+        # mmap the whole file and split once: avoids per-line buffered-IO
+        # overhead, and the page cache makes reloads (e.g. forked DataLoader
+        # workers) nearly free
+        with p.open('rb') as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            data = mm[:].decode('utf-8')
+        for raw in data.splitlines():
+            line = raw.strip()
+            if not line or line.startswith('#'):
+                continue
+            parts = line.split('\t')
+            if len(parts) < 2:
+                continue
+            key = parts[0].strip()
+            phones = parts[1].strip().split()
+            if key:
+                lex[key] = phones
     except Exception:
         return {}
+    # Write the cache for next time; ignore failures (e.g. read-only installs)
+    try:
+        cache.write_bytes(pickle.dumps(lex, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        pass
     return lex
 
 
 # load lexicon at import time if present
 _LEXICON = load_lexicon()
 
+# phone strings pre-joined once at load time, so the per-token hot loop in
+# khmer_g2p is a single dict probe instead of a probe plus a str.join over
+# the phone list for every occurrence of the word
+_LEXICON_PHONES = {word: " ".join(phones) for word, phones in _LEXICON.items()}
+
 
 def khmer_g2p(text: str, auto_segment: bool = False, return_word_list: bool = False) -> Union[str, List[str]]:
     """Convert Khmer text to a space-separated phoneme string.
@@ -58,16 +87,13 @@ def khmer_g2p(text: str, auto_segment: bool = False, return_word_list: bool = Fa
         text = segment_khmer_text(text, method='bidirectional')
     if text is None:
         return [] if return_word_list else ""
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _WS_RE.sub(" ", text).strip()
     if not text:
         return [] if return_word_list else ""
 
-    words: List[str] = []
-    for token in text.split(' '):
-        if token in _LEXICON:
-            words.append(" ".join(_LEXICON[token]))
-        else:
-            words.append(token)
+    # single dict probe per token; unknown tokens pass through unchanged
+    lexicon_get = _LEXICON_PHONES.get
+    words: List[str] = [lexicon_get(token, token) for token in text.split(' ')]
 
     if return_word_list:
         return words
@@ -84,7 +110,7 @@ def khmer_to_chars(text: str) -> List[str]:
     """
     if text is None:
         return []
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _WS_RE.sub(" ", text).strip()
     return list(text)
 
 
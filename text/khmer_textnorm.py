@@ -4,6 +4,7 @@ Hệ thống chuẩn hóa văn bản tiếng Khmer đầy đủ dựa trên text
 """
 
 import re
+import functools
 from typing import Dict, List, Tuple, Optional
 from pathlib import Path
 from collections import defaultdict
@@ -29,6 +30,10 @@ KHMER_MONTHS = {
     12: "ធ្នូ",
 }
 
+# Month names as a tuple indexable by the (already validated) month number,
+# skipping a dict hash per date match; slot 0 is a never-used sentinel
+_KHMER_MONTHS_T = ('',) + tuple(KHMER_MONTHS[i] for i in range(1, 13))
+
 # Khmer weekday abbreviations
 KHMER_WEEKDAYS = {
     "ច": "ចន្ទ",
@@ -57,6 +62,10 @@ KHMER_TO_ARABIC = {
     "៥": "5", "៦": "6", "៧": "7", "៨": "8", "៩": "9",
 }
 
+# Translation table for str.translate — one C-level pass instead of ten
+# str.replace scans
+_KHMER_TRANS = str.maketrans(KHMER_TO_ARABIC)
+
 # Basic Khmer numbers (0-20, 30, 40, 50, 60, 70, 80, 90, 100, 1000, etc.)
 KHMER_NUMBERS = {
     0: "សូន្យ",
@@ -142,168 +151,112 @@ EMOTICONS_MAP = {
 # TEST DATA LOADER - Load từ các file TSV
 # ============================================================================
 
+# Precompiled patterns used by the TSV loaders below (avoids re-parsing the
+# pattern on every row)
+_INT_RE = re.compile(r'integer:(-?\d+)')
+_DIGIT_RE = re.compile(r'digit:([០-៩0-9]+)')
+
 def _get_testdata_path(filename: str, subdir: str = "verbalizer") -> Path:
     """Get path to testdata file"""
     return Path(__file__).parent.parent / "textnorm" / subdir / "testdata" / filename
 
 
-def load_testdata_tsv(filename: str, subdir: str = "verbalizer") -> Dict:
-    """
-    Load test data từ file TSV.
-    Format: TYPE\tinput\toutput
-    Returns dict với các mappings
-    """
+def _iter_tsv(filename: str, subdir: str = "verbalizer"):
+    """Yield (type, input, output) rows from a testdata TSV in a single pass."""
     testdata_path = _get_testdata_path(filename, subdir)
-    data = defaultdict(dict)
-    
+
     if not testdata_path.exists():
-        return data
-    
+        return
+
     try:
         with open(testdata_path, 'r', encoding='utf-8') as f:
             for line in f:
                 line = line.strip()
                 if not line or line.startswith('#'):
                     continue
-                
+
                 parts = line.split('\t')
                 if len(parts) >= 3:
-                    data_type = parts[0]
-                    input_data = parts[1]
-                    output_data = parts[2]
-                    data[data_type][input_data] = output_data
+                    yield parts[0], parts[1], parts[2]
     except Exception as e:
         print(f"Error loading {filename}: {e}")
-    
+
+
+def load_testdata_tsv(filename: str, subdir: str = "verbalizer") -> Dict:
+    """
+    Load test data từ file TSV.
+    Format: TYPE\tinput\toutput
+    Returns dict với các mappings
+
+    Deprecated: kept as a shim for external callers; the loaders below
+    iterate `_iter_tsv` directly to avoid the intermediate nested dict.
+    """
+    data = defaultdict(dict)
+    for data_type, input_data, output_data in _iter_tsv(filename, subdir):
+        data[data_type][input_data] = output_data
     return data
 
 
 def load_cardinal_testdata() -> Dict[int, str]:
     """Load cardinal test data và tạo mapping số -> Khmer words"""
-    testdata = load_testdata_tsv("cardinal.tsv")
     cardinal_map = {}
-    
-    for data_type, mappings in testdata.items():
-        for input_str, output_str in mappings.items():
-            # Extract number from "cardinal|integer:123|"
-            match = re.search(r'integer:(-?\d+)', input_str)
-            if match:
-                num = int(match.group(1))
-                cardinal_map[num] = output_str
-    
+    for data_type, input_str, output_str in _iter_tsv("cardinal.tsv"):
+        # Extract number from "cardinal|integer:123|"
+        match = _INT_RE.search(input_str)
+        if match:
+            cardinal_map[int(match.group(1))] = output_str
     return cardinal_map
 
 
 def load_digit_testdata() -> Dict[str, str]:
     """Load digit test data"""
-    testdata = load_testdata_tsv("digit.tsv")
     digit_map = {}
-    
-    for data_type, mappings in testdata.items():
-        for input_str, output_str in mappings.items():
-            # Extract digit from "digit|digit:1|" or "digit|digit:១|"
-            match = re.search(r'digit:([០-៩0-9]+)', input_str)
-            if match:
-                digit = match.group(1)
-                digit_map[digit] = output_str
-    
+    for data_type, input_str, output_str in _iter_tsv("digit.tsv"):
+        # Extract digit from "digit|digit:1|" or "digit|digit:១|"
+        match = _DIGIT_RE.search(input_str)
+        if match:
+            digit_map[match.group(1)] = output_str
     return digit_map
 
 
 def load_date_testdata() -> List[Tuple[str, str]]:
     """Load date test data"""
-    testdata = load_testdata_tsv("date.tsv")
-    date_examples = []
-    
-    for data_type, mappings in testdata.items():
-        for input_str, output_str in mappings.items():
-            date_examples.append((input_str, output_str))
-    
-    return date_examples
+    return [(input_str, output_str) for _, input_str, output_str in _iter_tsv("date.tsv")]
 
 
 def load_time_testdata() -> List[Tuple[str, str]]:
     """Load time test data"""
-    testdata = load_testdata_tsv("time.tsv")
-    time_examples = []
-    
-    for data_type, mappings in testdata.items():
-        for input_str, output_str in mappings.items():
-            time_examples.append((input_str, output_str))
-    
-    return time_examples
+    return [(input_str, output_str) for _, input_str, output_str in _iter_tsv("time.tsv")]
 
 
 def load_money_testdata() -> List[Tuple[str, str]]:
     """Load money test data"""
-    testdata = load_testdata_tsv("money.tsv")
-    money_examples = []
-    
-    for data_type, mappings in testdata.items():
-        for input_str, output_str in mappings.items():
-            money_examples.append((input_str, output_str))
-    
-    return money_examples
+    return [(input_str, output_str) for _, input_str, output_str in _iter_tsv("money.tsv")]
 
 
 def load_measure_testdata() -> List[Tuple[str, str]]:
     """Load measure test data"""
-    testdata = load_testdata_tsv("measure.tsv")
-    measure_examples = []
-    
-    for data_type, mappings in testdata.items():
-        for input_str, output_str in mappings.items():
-            measure_examples.append((input_str, output_str))
-    
-    return measure_examples
+    return [(input_str, output_str) for _, input_str, output_str in _iter_tsv("measure.tsv")]
 
 
 def load_telephone_testdata() -> List[Tuple[str, str]]:
     """Load telephone test data"""
-    testdata = load_testdata_tsv("telephone.tsv")
-    telephone_examples = []
-    
-    for data_type, mappings in testdata.items():
-        for input_str, output_str in mappings.items():
-            telephone_examples.append((input_str, output_str))
-    
-    return telephone_examples
+    return [(input_str, output_str) for _, input_str, output_str in _iter_tsv("telephone.tsv")]
 
 
 def load_decimal_testdata() -> List[Tuple[str, str]]:
     """Load decimal test data"""
-    testdata = load_testdata_tsv("decimal.tsv")
-    decimal_examples = []
-    
-    for data_type, mappings in testdata.items():
-        for input_str, output_str in mappings.items():
-            decimal_examples.append((input_str, output_str))
-    
-    return decimal_examples
+    return [(input_str, output_str) for _, input_str, output_str in _iter_tsv("decimal.tsv")]
 
 
 def load_fraction_testdata() -> List[Tuple[str, str]]:
     """Load fraction test data"""
-    testdata = load_testdata_tsv("fraction.tsv")
-    fraction_examples = []
-    
-    for data_type, mappings in testdata.items():
-        for input_str, output_str in mappings.items():
-            fraction_examples.append((input_str, output_str))
-    
-    return fraction_examples
+    return [(input_str, output_str) for _, input_str, output_str in _iter_tsv("fraction.tsv")]
 
 
 def load_electronic_testdata() -> List[Tuple[str, str]]:
     """Load electronic (email/URL) test data"""
-    testdata = load_testdata_tsv("electronic.tsv")
-    electronic_examples = []
-    
-    for data_type, mappings in testdata.items():
-        for input_str, output_str in mappings.items():
-            electronic_examples.append((input_str, output_str))
-    
-    return electronic_examples
+    return [(input_str, output_str) for _, input_str, output_str in _iter_tsv("electronic.tsv")]
 
 
 # Load all test data
@@ -317,12 +270,24 @@ _DIGIT_TESTDATA = load_digit_testdata()
 
 def khmer_digit_to_arabic(text: str) -> str:
     """Convert Khmer digits to Arabic digits"""
-    result = text
-    for khmer, arabic in KHMER_TO_ARABIC.items():
-        result = result.replace(khmer, arabic)
-    return result
+    return text.translate(_KHMER_TRANS)
+
+
+# Deletes every Arabic and Khmer digit; what survives tells whether (and
+# where) a string holds anything besides digits, in one C-level pass
+_DIGIT_DROP_TT = str.maketrans('', '', '0123456789០១២៣៤៥៦៧៨៩')
+
+
+def _is_all_digits(s: str) -> bool:
+    """True when `s` is non-empty and entirely ASCII/Khmer digits."""
+    return bool(s) and not s.translate(_DIGIT_DROP_TT)
 
 
+# Scales handled by number_to_khmer_words, largest first (លាន, សែន, ម៉ឺន, ...)
+_KHMER_SCALES = (1000000, 100000, 10000, 1000, 100)
+
+
+@functools.lru_cache(maxsize=65536)
 def number_to_khmer_words(num: int, use_testdata: bool = True) -> str:
     """
     Chuyển đổi số nguyên sang từ tiếng Khmer.
@@ -331,75 +296,71 @@ def number_to_khmer_words(num: int, use_testdata: bool = True) -> str:
     # Use test data if available
     if use_testdata and num in _CARDINAL_TESTDATA:
         return _CARDINAL_TESTDATA[num]
-    
+
     if num < 0:
         return "ដក " + number_to_khmer_words(-num, use_testdata)
-    
+
     if num in KHMER_NUMBERS:
         return KHMER_NUMBERS[num]
-    
+
     # Handle numbers 21-99
-    if 21 <= num < 100:
-        tens = (num // 10) * 10
-        ones = num % 10
+    if num < 100:
+        tens, ones = divmod(num, 10)
         if ones == 0:
-            return KHMER_NUMBERS[tens]
-        return f"{KHMER_NUMBERS[tens]} {KHMER_NUMBERS[ones]}"
-    
-    # Handle hundreds
-    if 100 <= num < 1000:
-        hundreds = num // 100
-        remainder = num % 100
-        if remainder == 0:
-            return f"{number_to_khmer_words(hundreds, use_testdata)} {KHMER_NUMBERS[100]}"
-        return f"{number_to_khmer_words(hundreds, use_testdata)} {KHMER_NUMBERS[100]} {number_to_khmer_words(remainder, use_testdata)}"
-    
-    # Handle thousands
-    if 1000 <= num < 10000:
-        thousands = num // 1000
-        remainder = num % 1000
-        if remainder == 0:
-            return f"{number_to_khmer_words(thousands, use_testdata)} {KHMER_NUMBERS[1000]}"
-        return f"{number_to_khmer_words(thousands, use_testdata)} {KHMER_NUMBERS[1000]} {number_to_khmer_words(remainder, use_testdata)}"
-    
-    # Handle ten thousands (ម៉ឺន)
-    if 10000 <= num < 100000:
-        ten_thousands = num // 10000
-        remainder = num % 10000
-        if remainder == 0:
-            return f"{number_to_khmer_words(ten_thousands, use_testdata)} {KHMER_NUMBERS[10000]}"
-        return f"{number_to_khmer_words(ten_thousands, use_testdata)} {KHMER_NUMBERS[10000]} {number_to_khmer_words(remainder, use_testdata)}"
-    
-    # Handle hundred thousands (សែន)
-    if 100000 <= num < 1000000:
-        hundred_thousands = num // 100000
-        remainder = num % 100000
-        if remainder == 0:
-            return f"{number_to_khmer_words(hundred_thousands, use_testdata)} {KHMER_NUMBERS[100000]}"
-        return f"{number_to_khmer_words(hundred_thousands, use_testdata)} {KHMER_NUMBERS[100000]} {number_to_khmer_words(remainder, use_testdata)}"
-    
-    # Handle millions (លាន)
-    if 1000000 <= num < 10000000:
-        millions = num // 1000000
-        remainder = num % 1000000
-        if remainder == 0:
-            return f"{number_to_khmer_words(millions, use_testdata)} {KHMER_NUMBERS[1000000]}"
-        return f"{number_to_khmer_words(millions, use_testdata)} {KHMER_NUMBERS[1000000]} {number_to_khmer_words(remainder, use_testdata)}"
-    
+            return KHMER_NUMBERS[tens * 10]
+        return f"{KHMER_NUMBERS[tens * 10]} {KHMER_NUMBERS[ones]}"
+
     # For very large numbers, return as string (can be extended)
+    if num >= 10000000:
+        return str(num)
+
+    # Split off the largest applicable scale and recurse on the remainder:
+    # every level re-checks testdata/KHMER_NUMBERS (so 1100 stays
+    # "មួយ ពាន់ រយ", not "មួយ ពាន់ មួយ រយ") and the lru_cache keeps the
+    # repeated sub-expressions free
+    for scale in _KHMER_SCALES:
+        if num >= scale:
+            quotient, remainder = divmod(num, scale)
+            head = f"{number_to_khmer_words(quotient, use_testdata)} {KHMER_NUMBERS[scale]}"
+            if remainder == 0:
+                return head
+            return f"{head} {number_to_khmer_words(remainder, use_testdata)}"
+
     return str(num)
 
 
+# Warm the cache with the numbers that dominate real text (counts, days,
+# minutes, percentages) so even first encounters are dict hits
+for _n in range(100):
+    number_to_khmer_words(_n)
+del _n
+
+
+# Khmer word for each single digit, indexable by ord(c) - 48 — skips the
+# int() parse and dict hash per character
+_DIGIT_WORDS = tuple(KHMER_NUMBERS[i] for i in range(10))
+
+# Maps every Arabic and Khmer digit straight to its spoken word plus a
+# trailing space, so a digit run is verbalized in one C-level translate pass
+_DIGIT_SPEAK_TABLE = str.maketrans({
+    **{str(i): word + ' ' for i, word in enumerate(_DIGIT_WORDS)},
+    **{khmer: _DIGIT_WORDS[int(arabic)] + ' ' for khmer, arabic in KHMER_TO_ARABIC.items()},
+})
+
+
 def digits_to_khmer_words(digits: str) -> str:
     """Convert sequence of digits to Khmer words (e.g., "123" -> "មួយ ពីរ បី")"""
-    # Convert Khmer digits to Arabic first
+    # Convert Khmer digits to Arabic first (testdata keys use Arabic digits)
     digits = khmer_digit_to_arabic(digits)
-    
+
     # Use test data if available
     if digits in _DIGIT_TESTDATA:
         return _DIGIT_TESTDATA[digits]
-    
-    # Convert each digit
+
+    if _is_all_digits(digits):
+        return digits.translate(_DIGIT_SPEAK_TABLE).rstrip()
+
+    # Mixed input (public API): space-join every character as before
     result = []
     for digit in digits:
         if digit.isdigit():
@@ -407,7 +368,7 @@ def digits_to_khmer_words(digits: str) -> str:
             result.append(KHMER_NUMBERS.get(num, digit))
         else:
             result.append(digit)
-    
+
     return " ".join(result)
 
 
@@ -415,24 +376,55 @@ def digits_to_khmer_words(digits: str) -> str:
 # NORMALIZATION FUNCTIONS
 # ============================================================================
 
+# All patterns used by the normalize_* passes, compiled once at import so the
+# per-call re._compile cache lookup and flag parsing are never paid
+_CARDINAL_RE = re.compile(r'\b[\d០-៩]+\b')
+_DIGIT_RUN_RE = re.compile(r'\b[\d០-៩]{2,}\b')
+_DECIMAL_RE = re.compile(r'-?\d+[.,]\d+')
+_FRACTION_RE = re.compile(r'\b(-?\d+)/(\d+)\b')
+_FRACTION_NO_YEAR_RE = re.compile(r'(?<!\d/)\b(-?\d+)/(\d+)\b(?![/-]\d)')  # skips D/M/Y shapes outright
+_DATE_RE = re.compile(r'\b(\d{1,2})[/-](\d{1,2})(?:[/-](\d{2,4}))\b')
+_TIME_RE = re.compile(r'(\d{1,2}):(\d{2})(?::(\d{2}))?')
+_MONEY_USD_RE = re.compile(r'\$(\d+(?:\.\d+)?)')
+_MONEY_KHR_RE = re.compile(r'(\d+(?:\.\d+)?)\s*រៀល')
+_PHONE_RE = re.compile(r'\b(?:0\d{2}[-.\s]?\d{3}[-.\s]?\d{3,4}|\+?\d{1,3}[-.\s]?\d{3,4}[-.\s]?\d{3,4}[-.\s]?\d{3,4})\b')
+_SEP_RE = re.compile(r'[-.\s]')
+_MEASURE_RE = re.compile(r'(\d+)\s*(km|kg|m|g|l|liter|meter|gram|kilogram|kilometer|percent|%)', re.IGNORECASE)
+_EMAIL_RE = re.compile(r'(\w+(?:[._]\w+)*)@([\w.-]+)')
+_URL_RE = re.compile(r'https?://[\w.-]+')
+# One combined pattern for every day[/-]month[/-]year? shape: the year branch
+# comes first so DD/MM/YYYY is captured whole — alternation order does the
+# selection, no lookaround needed. The pair branch covers both fractions
+# (slash) and no-year dates, and the handler branches on which groups matched
+_DATE_OR_FRAC_RE = re.compile(
+    r'\b(?:(?P<df_day>\d{1,2})[/-](?P<df_month>\d{1,2})[/-](?P<df_year>\d{2,4})\b'
+    r'|(?P<df_num>-?\d+)(?P<df_sep>[/-])(?P<df_den>\d+)\b)'
+)
+
+def _replace_cardinal(match):
+    num_str = match.group(0)
+    # Convert Khmer digits to Arabic
+    num_str = khmer_digit_to_arabic(num_str)
+    # One translate probe instead of letting int() raise on non-digit text
+    if not _is_all_digits(num_str):
+        return num_str
+    try:
+        return number_to_khmer_words(int(num_str))
+    except ValueError:  # int-str conversion limit on absurdly long runs
+        return num_str
+
+
 def normalize_cardinal(text: str) -> str:
     """
     Normalize cardinal numbers trong text.
     Tìm và thay thế các số bằng từ Khmer.
     """
-    def replace_number(match):
-        num_str = match.group(0)
-        # Convert Khmer digits to Arabic
-        num_str = khmer_digit_to_arabic(num_str)
-        try:
-            num = int(num_str)
-            return number_to_khmer_words(num)
-        except ValueError:
-            return num_str
-    
     # Pattern để tìm số nguyên (cả Arabic và Khmer digits)
-    pattern = r'\b[\d០-៩]+\b'
-    return re.sub(pattern, replace_number, text)
+    return _CARDINAL_RE.sub(_replace_cardinal, text)
+
+
+def _replace_digits(match):
+    return digits_to_khmer_words(match.group(0))
 
 
 def normalize_digit(text: str) -> str:
@@ -440,14 +432,9 @@ def normalize_digit(text: str) -> str:
     Normalize digit sequences (chữ số riêng lẻ).
     Ví dụ: "123" -> "មួយ ពីរ បី"
     """
-    def replace_digits(match):
-        digits = match.group(0)
-        return digits_to_khmer_words(digits)
-    
     # Pattern để tìm chuỗi số (ưu tiên số dài hơn)
     # Tìm số có ít nhất 2 chữ số để tránh conflict với cardinal
-    pattern = r'\b[\d០-៩]{2,}\b'
-    return re.sub(pattern, replace_digits, text)
+    return _DIGIT_RUN_RE.sub(_replace_digits, text)
 
 
 def _normalize_fractional_part(fractional_part: str) -> str:
@@ -455,65 +442,53 @@ def _normalize_fractional_part(fractional_part: str) -> str:
     Normalize fractional part: leading zeros digit-by-digit, rest as cardinal.
     Based on decimal.grm
     """
-    # Count leading zeros
-    leading_zeros_count = 0
-    for char in fractional_part:
-        if char == '0':
-            leading_zeros_count += 1
-        else:
-            break
-    
-    fractional_khmer_parts = []
-    # Add leading zeros
-    for _ in range(leading_zeros_count):
-        fractional_khmer_parts.append("សូន្យ")
-    
-    # Convert the rest as cardinal
-    rest_part = fractional_part[leading_zeros_count:]
+    # Count leading zeros via lstrip (C-level) instead of a char loop
+    rest_part = fractional_part.lstrip('0')
+    leading_zeros_count = len(fractional_part) - len(rest_part)
+
+    # One "សូន្យ" per leading zero, then the rest as cardinal
+    fractional_khmer_parts = ["សូន្យ"] * leading_zeros_count
     if rest_part:
         fractional_khmer_parts.append(number_to_khmer_words(int(rest_part)))
-    elif leading_zeros_count == 0:
-        # Should not happen if fractional_part is not empty and contains digits
-        pass
-        
+
     return " ".join(fractional_khmer_parts)
 
 
+def _replace_decimal(match):
+    full_match = match.group(0)
+    # Check for negative
+    is_negative = full_match.startswith('-')
+    number_part = full_match.lstrip('-')
+
+    # Split by . or ,
+    if '.' in number_part:
+        parts = number_part.split('.')
+    elif ',' in number_part:
+        parts = number_part.split(',')
+    else:
+        return full_match
+
+    integer_part = parts[0]
+    fractional_part = parts[1] if len(parts) > 1 else ""
+
+    # Convert parts
+    integer_khmer = number_to_khmer_words(int(integer_part)) if integer_part else "សូន្យ"
+    fractional_khmer = _normalize_fractional_part(fractional_part) if fractional_part else ""
+
+    result = f"{'ដក ' if is_negative else ''}{integer_khmer}"
+    if fractional_khmer:
+        result += f" ក្បៀស {fractional_khmer}"
+
+    return result
+
+
 def normalize_decimal(text: str) -> str:
     """
     Normalize decimal numbers.
     Ví dụ: "4.5" -> "បួន ក្បៀស ប្រាំ"
     """
-    def replace_decimal(match):
-        full_match = match.group(0)
-        # Check for negative
-        is_negative = full_match.startswith('-')
-        number_part = full_match.lstrip('-')
-        
-        # Split by . or ,
-        if '.' in number_part:
-            parts = number_part.split('.')
-        elif ',' in number_part:
-            parts = number_part.split(',')
-        else:
-            return full_match
-        
-        integer_part = parts[0]
-        fractional_part = parts[1] if len(parts) > 1 else ""
-        
-        # Convert parts
-        integer_khmer = number_to_khmer_words(int(integer_part)) if integer_part else "សូន្យ"
-        fractional_khmer = _normalize_fractional_part(fractional_part) if fractional_part else ""
-        
-        result = f"{'ដក ' if is_negative else ''}{integer_khmer}"
-        if fractional_khmer:
-            result += f" ក្បៀស {fractional_khmer}"
-        
-        return result
-    
     # Pattern cho decimal: số có dấu . hoặc , với phần thập phân
-    pattern = r'-?\d+[.,]\d+'
-    return re.sub(pattern, replace_decimal, text)
+    return _DECIMAL_RE.sub(_replace_decimal, text)
 
 
 def normalize_fraction(text: str, skip_dates: bool = True) -> str:
@@ -521,28 +496,19 @@ def normalize_fraction(text: str, skip_dates: bool = True) -> str:
     Normalize fractions.
     Ví dụ: "4/5" -> "បួន លើ ប្រាំ"
     """
-    # Store positions that look like dates to skip them
-    date_positions = set()
-    if skip_dates:
-        # Find all potential dates first
-        date_pattern = r'\b(\d{1,2})/(\d{1,2})(?:/(\d{2,4}))?\b'
-        for match in re.finditer(date_pattern, text):
-            month = int(match.group(2))
-            # If month is 1-12, it's likely a date
-            if 1 <= month <= 12:
-                date_positions.add((match.start(), match.end()))
-    
     def replace_fraction(match):
-        # Check if this position was identified as a date
-        if skip_dates and (match.start(), match.end()) in date_positions:
-            return match.group(0)
-        
         numerator = match.group(1)
         denominator = match.group(2)
-        
+
         num_val = int(numerator.lstrip('-'))
         den_val = int(denominator)
-        
+
+        # A 1-2 digit day over a 1-12 month looks like a date, skip it
+        # (decided right here from the match instead of precomputing every
+        # date span with a second finditer scan)
+        if skip_dates and 1 <= den_val <= 12 and num_val < 100 and not numerator.startswith('-'):
+            return match.group(0)
+
         # If denominator is > 31, it's definitely a fraction
         # If numerator is > 31, it's likely a fraction
         # If both are small (<=31), check if denominator could be a month (1-12)
@@ -562,11 +528,11 @@ def normalize_fraction(text: str, skip_dates: bool = True) -> str:
             denominator_khmer = number_to_khmer_words(den_val)
             result = f"{'ដក ' if is_negative else ''}{numerator_khmer} លើ {denominator_khmer}"
             return result
-    
-    # Pattern cho fraction: số/số
-    pattern = r'\b(-?\d+)/(\d+)\b'
-    text = re.sub(pattern, replace_fraction, text)
-    return text
+
+    # Pattern cho fraction: số/số — the lookahead variant lets the regex
+    # engine itself step over dates with a year
+    pattern = _FRACTION_NO_YEAR_RE if skip_dates else _FRACTION_RE
+    return pattern.sub(replace_fraction, text)
 
 
 def normalize_date(text: str) -> str:
@@ -584,7 +550,7 @@ def normalize_date(text: str) -> str:
             return match.group(0)  # Not a valid date
         
         day_khmer = number_to_khmer_words(day)
-        month_name = KHMER_MONTHS.get(month, f"ខែ{month}")
+        month_name = _KHMER_MONTHS_T[month]
         
         if year:
             year_khmer = number_to_khmer_words(year)
@@ -594,50 +560,73 @@ def normalize_date(text: str) -> str:
     
     # Pattern cho DD/MM/YYYY hoặc DD-MM-YYYY (chỉ match nếu có year hoặc month hợp lệ)
     # Avoid matching phone numbers by requiring year or checking month validity
-    date_pattern = r'\b(\d{1,2})[/-](\d{1,2})(?:[/-](\d{2,4}))\b'
-    text = re.sub(date_pattern, replace_date_slash, text)
+    text = _DATE_RE.sub(replace_date_slash, text)
     
     # Pattern cho "day month year" format (Khmer)
     # Có thể thêm các pattern khác ở đây
     return text
 
 
+def _replace_time(match):
+    hours = int(match.group(1))
+    minutes = int(match.group(2)) if match.group(2) else 0
+    seconds = int(match.group(3)) if match.group(3) else None
+
+    hours_khmer = number_to_khmer_words(hours)
+    result = f"ម៉ោង {hours_khmer}"
+
+    if minutes > 0:
+        minutes_khmer = number_to_khmer_words(minutes)
+        result += f" {minutes_khmer} នាទី"
+
+    if seconds is not None and seconds > 0:
+        seconds_khmer = number_to_khmer_words(seconds)
+        result += f" {seconds_khmer} វិនាទី"
+
+    # Add period (sáng/chiều/tối) based on hours
+    if 5 <= hours < 12:
+        result += " ពេលព្រឹក"
+    elif 12 <= hours < 17:
+        result += " ពេលរសៀល"
+    elif 17 <= hours < 21:
+        result += " ល្ងាច"
+    elif 21 <= hours or hours < 5:
+        result += " យប់"
+
+    return result
+
+
 def normalize_time(text: str) -> str:
     """
     Normalize time.
     Ví dụ: "10:30" -> "ម៉ោង ដប់ ម៉ោង សាមសិប នាទី"
     """
-    def replace_time(match):
-        hours = int(match.group(1))
-        minutes = int(match.group(2)) if match.group(2) else 0
-        seconds = int(match.group(3)) if match.group(3) else None
-        
-        hours_khmer = number_to_khmer_words(hours)
-        result = f"ម៉ោង {hours_khmer}"
-        
-        if minutes > 0:
-            minutes_khmer = number_to_khmer_words(minutes)
-            result += f" {minutes_khmer} នាទី"
-        
-        if seconds is not None and seconds > 0:
-            seconds_khmer = number_to_khmer_words(seconds)
-            result += f" {seconds_khmer} វិនាទី"
-        
-        # Add period (sáng/chiều/tối) based on hours
-        if 5 <= hours < 12:
-            result += " ពេលព្រឹក"
-        elif 12 <= hours < 17:
-            result += " ពេលរសៀល"
-        elif 17 <= hours < 21:
-            result += " ល្ងាច"
-        elif 21 <= hours or hours < 5:
-            result += " យប់"
-        
-        return result
-    
     # Pattern cho time: HH:MM hoặc HH:MM:SS
-    time_pattern = r'(\d{1,2}):(\d{2})(?::(\d{2}))?'
-    return re.sub(time_pattern, replace_time, text)
+    return _TIME_RE.sub(_replace_time, text)
+
+
+# The two currencies with dedicated patterns, resolved once instead of a
+# dict probe per match
+_USD_NAME = CURRENCY_NAMES['usd']
+_KHR_NAME = CURRENCY_NAMES['khr']
+
+
+def _replace_money_amount(amount: str, currency_name: str) -> str:
+    if '.' in amount:
+        integer_part, fractional_part = amount.split('.')
+        integer_khmer = number_to_khmer_words(int(integer_part))
+        fractional_khmer = _normalize_fractional_part(fractional_part)
+        return f"{integer_khmer} ក្បៀស {fractional_khmer} {currency_name}"
+    integer_khmer = number_to_khmer_words(int(amount))
+    return f"{integer_khmer} {currency_name}"
+
+
+def _replace_money_dollar(match):
+    return _replace_money_amount(match.group(1), _USD_NAME)
+
+
+def _replace_money_riel(match):
+    return _replace_money_amount(match.group(1), _KHR_NAME)
 
 
 def normalize_money(text: str) -> str:
@@ -645,72 +634,64 @@ def normalize_money(text: str) -> str:
     Normalize money trong text.
     Hỗ trợ: $100, 100 riel, etc.
     """
-    def replace_money_dollar(match):
-        amount = match.group(1)
-        if '.' in amount:
-            integer_part, fractional_part = amount.split('.')
-            integer_khmer = number_to_khmer_words(int(integer_part))
-            fractional_khmer = _normalize_fractional_part(fractional_part)
-            return f"{integer_khmer} ក្បៀស {fractional_khmer} {CURRENCY_NAMES['usd']}"
-        else:
-            integer_khmer = number_to_khmer_words(int(amount))
-            return f"{integer_khmer} {CURRENCY_NAMES['usd']}"
-    
     # Pattern cho $number (process before decimal normalization)
-    money_pattern1 = r'\$(\d+(?:\.\d+)?)'
-    text = re.sub(money_pattern1, replace_money_dollar, text)
-    
+    text = _MONEY_USD_RE.sub(_replace_money_dollar, text)
+
     # Pattern cho number riel
-    def replace_money_riel(match):
-        amount = match.group(1)
-        if '.' in amount:
-            integer_part, fractional_part = amount.split('.')
-            integer_khmer = number_to_khmer_words(int(integer_part))
-            fractional_khmer = _normalize_fractional_part(fractional_part)
-            return f"{integer_khmer} ក្បៀស {fractional_khmer} {CURRENCY_NAMES['khr']}"
-        else:
-            integer_khmer = number_to_khmer_words(int(amount))
-            return f"{integer_khmer} {CURRENCY_NAMES['khr']}"
-    
-    money_pattern2 = r'(\d+(?:\.\d+)?)\s*រៀល'
-    text = re.sub(money_pattern2, replace_money_riel, text)
-    
+    text = _MONEY_KHR_RE.sub(_replace_money_riel, text)
+
     return text
 
 
+# Maps each phone digit straight to its spoken word plus a space, so a whole
+# digit group is verbalized by one C-level translate instead of a char loop
+_PHONE_TT = str.maketrans({c: KHMER_NUMBERS[int(c)] + ' ' for c in '0123456789'})
+
+
+def _replace_phone(match):
+    # Remove separators
+    digits = _SEP_RE.sub('', match.group(0))
+
+    # Split into groups of 3-4 digits with sil between them
+    groups = []
+    i = 0
+    while i < len(digits):
+        group_size = 3 if len(digits) - i >= 6 else min(4, len(digits) - i)
+        groups.append(digits[i:i+group_size])
+        i += group_size
+    return " sil ".join(group.translate(_PHONE_TT).rstrip() for group in groups)
+
+
 def normalize_telephone(text: str) -> str:
     """
     Normalize telephone numbers.
     Ví dụ: "012-345-678" -> "សូន្យ មួយ ពីរ sil បី បួន ប្រាំ sil ប្រាំមួយ ប្រាំបី ប្រាំបី"
     """
-    def replace_phone(match):
-        # Get all number parts
-        phone_str = match.group(0)
-        # Remove separators
-        digits = re.sub(r'[-.\s]', '', phone_str)
-        
-        # Convert to Khmer words with sil between groups
-        # Group digits (typically 3-4 digits per group)
-        result = []
-        # Split into groups of 3-4 digits
-        i = 0
-        while i < len(digits):
-            if i > 0:
-                result.append("sil")
-            # Take 3-4 digits
-            group_size = 3 if len(digits) - i >= 6 else min(4, len(digits) - i)
-            group = digits[i:i+group_size]
-            # Convert each digit in group
-            for digit in group:
-                result.append(KHMER_NUMBERS.get(int(digit), digit))
-            i += group_size
-        return " ".join(result)
-    
     # Pattern cho phone numbers: các số với separators - . hoặc space
     # Avoid matching dates by requiring longer sequences or specific patterns
     # Match: 10+ digits total, or patterns like 0XX-XXX-XXX
-    phone_pattern = r'\b(?:0\d{2}[-.\s]?\d{3}[-.\s]?\d{3,4}|\+?\d{1,3}[-.\s]?\d{3,4}[-.\s]?\d{3,4}[-.\s]?\d{3,4})\b'
-    return re.sub(phone_pattern, replace_phone, text)
+    return _PHONE_RE.sub(_replace_phone, text)
+
+
+# Case-folded unit table: the measure regex is IGNORECASE, so the unit can
+# arrive in any casing; units are lowercase in running text almost always,
+# so probe as-is first and only casefold on a miss
+_MEASURE_UNITS_CF = {k.casefold(): v for k, v in MEASURE_UNITS.items()}
+
+
+def _replace_measure(match):
+    number = match.group(1)
+    unit = match.group(2)
+
+    # Convert number
+    number_khmer = number_to_khmer_words(int(number))
+
+    # Get unit in Khmer
+    unit_khmer = _MEASURE_UNITS_CF.get(unit)
+    if unit_khmer is None:
+        unit_khmer = _MEASURE_UNITS_CF.get(unit.casefold(), unit)
+
+    return f"{number_khmer} {unit_khmer}"
 
 
 def normalize_measure(text: str) -> str:
@@ -718,34 +699,43 @@ def normalize_measure(text: str) -> str:
     Normalize measurements.
     Ví dụ: "5 km" -> "ប្រាំ គីឡូ ម៉ែត្រ"
     """
-    def replace_measure(match):
-        number = match.group(1)
-        unit = match.group(2).lower()
-        
-        # Convert number
-        number_khmer = number_to_khmer_words(int(number))
-        
-        # Get unit in Khmer
-        unit_khmer = MEASURE_UNITS.get(unit, unit)
-        
-        return f"{number_khmer} {unit_khmer}"
-    
     # Pattern cho measure: số + unit
     # Common units: km, kg, m, g, l, etc.
-    measure_pattern = r'(\d+)\s*(km|kg|m|g|l|liter|meter|gram|kilogram|kilometer|percent|%)'
-    return re.sub(measure_pattern, replace_measure, text, flags=re.IGNORECASE)
-
-
-def normalize_electronic(text: str) -> str:
-    """
-    Normalize electronic addresses (email, URL).
-    Ví dụ: "test@example.com" -> "t_letter-en e_letter-en s_letter-en t_letter-en អ៊ែត example ដត់ com"
-    """
-    def replace_email(match):
-        username = match.group(1)
-        domain = match.group(2)
-        
-        # Convert username to letter-by-letter
+    return _MEASURE_RE.sub(_replace_measure, text)
+
+
+# Spells an ASCII username in one translate pass: letters spoken as
+# "<letter>_letter-en", digits as their Khmer word, "._" kept as-is
+_EMAIL_USER_TT = str.maketrans({
+    **{c: c.lower() + '_letter-en ' for c in
+       'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'},
+    **{c: KHMER_NUMBERS[int(c)] + ' ' for c in '0123456789'},
+    '.': '. ', '_': '_ ',
+})
+
+# Domain labels are spelled letter-by-letter with digits spoken as their
+# Khmer words (the later cardinal pass no longer sees this replacement, so
+# they must be verbalized here); the domain regex only admits word chars,
+# '.' and '-', so this covers them all
+_EMAIL_DOMAIN_TT = str.maketrans({
+    **{c: c.lower() + '_letter-en ' for c in
+       'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'},
+    **{c: KHMER_NUMBERS[int(c)] + ' ' for c in '0123456789'},
+    '_': '_ ', '-': '- ',
+})
+
+# Well-known TLDs are read out as-is rather than spelled
+_PLAIN_TLDS = frozenset({'com', 'org', 'net', 'edu'})
+
+
+def _replace_email(match):
+    username = match.group(1)
+    domain = match.group(2)
+
+    # Convert username to letter-by-letter
+    if username.isascii():
+        username_spoken = username.translate(_EMAIL_USER_TT).rstrip()
+    else:
         username_khmer = []
         for char in username:
             if char.isalpha():
@@ -754,52 +744,205 @@ def normalize_electronic(text: str) -> str:
                 username_khmer.append(number_to_khmer_words(int(char)))
             else:
                 username_khmer.append(char)
-        
-        # Convert domain
-        domain_parts = domain.split('.')
-        domain_khmer = []
-        for part in domain_parts:
-            if part in ['com', 'org', 'net', 'edu']:
-                domain_khmer.append(part)
-            else:
-                # Convert letter by letter
-                for char in part:
-                    if char.isalpha():
-                        domain_khmer.append(f"{char.lower()}_letter-en")
-                    else:
-                        domain_khmer.append(char)
-            domain_khmer.append("ដត់")
-        
-        return " ".join(username_khmer) + " អ៊ែត " + " ".join(domain_khmer[:-1])
-    
-    # Pattern cho email
-    email_pattern = r'(\w+(?:[._]\w+)*)@([\w.-]+)'
-    text = re.sub(email_pattern, replace_email, text)
-    
-    # Pattern cho URL (simplified)
-    def replace_url(match):
-        url = match.group(0)
-        # Convert www. to Khmer
-        url = url.replace('www.', 'ដាប់ប៊លយូ ដាប់ប៊លយូ ដាប់ប៊លយូ ដត់ ')
-        return url
-    
-    url_pattern = r'https?://[\w.-]+'
-    text = re.sub(url_pattern, replace_url, text)
-    
+        username_spoken = " ".join(username_khmer)
+
+    # Convert domain
+    domain_parts = domain.split('.')
+    domain_khmer = []
+    for part in domain_parts:
+        if part in _PLAIN_TLDS:
+            domain_khmer.append(part)
+        elif part.isascii():
+            # Spell the whole label with one translate pass
+            if part:
+                domain_khmer.append(part.translate(_EMAIL_DOMAIN_TT).rstrip())
+        else:
+            # Convert letter by letter
+            for char in part:
+                if char.isalpha():
+                    domain_khmer.append(f"{char.lower()}_letter-en")
+                elif char.isdigit():
+                    domain_khmer.append(number_to_khmer_words(int(char)))
+                else:
+                    domain_khmer.append(char)
+        domain_khmer.append("ដត់")
+
+    return username_spoken + " អ៊ែត " + " ".join(domain_khmer[:-1])
+
+
+def _replace_url(match):
+    url = match.group(0)
+    # Convert www. to Khmer
+    return url.replace('www.', 'ដាប់ប៊លយូ ដាប់ប៊លយូ ដាប់ប៊លយូ ដត់ ')
+
+
+def normalize_electronic(text: str) -> str:
+    """
+    Normalize electronic addresses (email, URL).
+    Ví dụ: "test@example.com" -> "t_letter-en e_letter-en s_letter-en t_letter-en អ៊ែត example ដត់ com"
+    """
+    # Cheap C-level membership probes gate the regex passes: an email needs
+    # an '@' and a URL a '://', so most texts skip both scans outright
+    if '@' in text:
+        # Pattern cho email
+        text = _EMAIL_RE.sub(_replace_email, text)
+
+    if '://' in text:
+        # Pattern cho URL (simplified)
+        text = _URL_RE.sub(_replace_url, text)
+
     return text
 
 
+# All emoticon keys as one alternation, longest first so e.g. ">:-)" wins
+# over ":-)" — one scan instead of one str.replace pass per emoticon
+_EMO_RE = re.compile('|'.join(re.escape(k) for k in sorted(EMOTICONS_MAP, key=len, reverse=True)))
+
+
 def normalize_emoticons(text: str) -> str:
     """Normalize emoticons"""
-    for emoticon, khmer_text in EMOTICONS_MAP.items():
-        text = text.replace(emoticon, khmer_text)
-    return text
+    return _EMO_RE.sub(lambda m: EMOTICONS_MAP[m.group(0)], text)
+
+
+# ============================================================================
+# FUSED SCANNER
+# ============================================================================
+
+def _replace_fraction(match):
+    """Verbalize N/M as a fraction."""
+    numerator = match.group(1)
+    denominator = match.group(2)
+    num_val = int(numerator.lstrip('-'))
+    den_val = int(denominator)
+    is_negative = numerator.startswith('-')
+    numerator_khmer = number_to_khmer_words(num_val)
+    denominator_khmer = number_to_khmer_words(den_val)
+    return f"{'ដក ' if is_negative else ''}{numerator_khmer} លើ {denominator_khmer}"
+
+
+# Date-related words whose presence near a DD/MM or DD-MM pair marks it as a date
+_DATE_CONTEXT_WORDS = ('date', 'ngày', 'day', 'tháng', 'month')
+
+
+def _replace_date_or_fraction(match, dates, fractions):
+    """Verbalize one day[/-]month[/-]year? span from the fused scan, branching
+    on which optional groups matched; returns None when the span should fall
+    back to the general number passes."""
+    year = match.group('df_year')
+    if year is not None:
+        if not dates:
+            return None
+        month = int(match.group('df_month'))
+        if not 1 <= month <= 12:
+            return None
+        day_khmer = number_to_khmer_words(int(match.group('df_day')))
+        month_name = _KHMER_MONTHS_T[month]
+        year_khmer = number_to_khmer_words(int(year))
+        return f"{day_khmer} ខែ {month_name} ឆ្នាំ {year_khmer}"
+
+    numerator = match.group('df_num')
+    denominator = match.group('df_den')
+    if fractions and match.group('df_sep') == '/':
+        num_val = int(numerator.lstrip('-'))
+        is_negative = numerator.startswith('-')
+        numerator_khmer = number_to_khmer_words(num_val)
+        denominator_khmer = number_to_khmer_words(int(denominator))
+        return f"{'ដក ' if is_negative else ''}{numerator_khmer} លើ {denominator_khmer}"
+
+    if dates:
+        day = int(numerator)
+        month = int(denominator)
+        # Check context - look for date-related words nearby (in the original text)
+        text = match.string
+        context_before = text[max(0, match.start() - 20):match.start()].lower()
+        context_after = text[match.end():match.end() + 20].lower()
+        has_date_context = any(word in context_before + context_after for word in _DATE_CONTEXT_WORDS)
+
+        # Only normalize as date if:
+        # 1. Has date context, OR
+        # 2. Day > 12 (unlikely to be numerator of fraction, more likely day of month)
+        if (1 <= month <= 12 and 1 <= day <= 31) and (has_date_context or day > 12):
+            day_khmer = number_to_khmer_words(day)
+            month_name = _KHMER_MONTHS_T[month]
+            return f"{day_khmer} ខែ {month_name}"
+    return None
+
+
+def _normalize_declined(span, fractions, decimals, cardinals, digits):
+    """Run the general number passes over a span a date handler declined, so
+    e.g. "45/99/2020" still gets its numbers verbalized like in a plain scan."""
+    if fractions:
+        span = _FRACTION_RE.sub(_replace_fraction, span)
+    if decimals:
+        span = _DECIMAL_RE.sub(_replace_decimal, span)
+    if cardinals:
+        span = _CARDINAL_RE.sub(_replace_cardinal, span)
+    elif digits:
+        span = _DIGIT_RUN_RE.sub(_replace_digits, span)
+    return span
+
+
+# Alternatives for the fused scanner, ordered by specificity so that when two
+# patterns match at the same position the more specific one wins — mirroring
+# the old one-pass-per-pattern ordering without rescanning the text each time
+_MASTER_PATTERNS = (
+    ('email', _EMAIL_RE),
+    ('url', _URL_RE),
+    ('phone', _PHONE_RE),
+    ('time', _TIME_RE),
+    ('money_usd', _MONEY_USD_RE),
+    ('money_khr', _MONEY_KHR_RE),
+    ('measure', _MEASURE_RE),
+    ('datefrac', _DATE_OR_FRAC_RE),
+    ('decimal', _DECIMAL_RE),
+    ('cardinal', _CARDINAL_RE),
+    ('digits', _DIGIT_RUN_RE),
+)
+
+_COMPONENT_RES = dict(_MASTER_PATTERNS)
+
+# datefrac is dispatched specially (it can decline); every other group maps
+# straight to its handler
+_MASTER_HANDLERS = {
+    'email': _replace_email,
+    'url': _replace_url,
+    'phone': _replace_phone,
+    'time': _replace_time,
+    'money_usd': _replace_money_dollar,
+    'money_khr': _replace_money_riel,
+    'measure': _replace_measure,
+    'decimal': _replace_decimal,
+    'cardinal': _replace_cardinal,
+    'digits': _replace_digits,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _master_re(enabled: tuple):
+    """Compile the fused alternation for one combination of enabled groups.
+
+    Per-component flags (measure is IGNORECASE) are scoped inline so they do
+    not leak into the other alternatives.
+    """
+    parts = []
+    for name, component in _MASTER_PATTERNS:
+        if name in enabled:
+            pattern = component.pattern
+            if component.flags & re.IGNORECASE:
+                pattern = f'(?i:{pattern})'
+            parts.append(f'(?P<{name}>{pattern})')
+    return re.compile('|'.join(parts))
 
 
 # ============================================================================
 # MAIN NORMALIZATION FUNCTION
 # ============================================================================
 
+# Characters that could start any normalizable pattern: digits (Arabic and
+# Khmer), Latin letters (emails/URLs/units), currency/percent signs, and the
+# emoticon trigger characters. Pure Khmer prose matches none of these.
+_NEEDS_NORM_RE = re.compile(r"[0-9០-៩A-Za-z%៛$@:=;☹☺☻]")
+
 def normalize_khmer_text(text: str,
                          normalize_cardinals: bool = True,
                          normalize_digits: bool = False,  # Usually not needed if cardinals are normalized
@@ -814,111 +957,78 @@ def normalize_khmer_text(text: str,
                          normalize_emoticons_flag: bool = True) -> str:
     """
     Normalize Khmer text bằng cách xử lý tất cả các loại văn bản đặc biệt.
-    
+
+    All enabled patterns are matched in one fused scan (dispatching on
+    `match.lastgroup`) instead of one full re.sub pass per pattern, so the
+    text is walked once regardless of how many normalizations are on.
+
     Args:
         text: Input text
         normalize_*: Flags để bật/tắt từng loại normalization
-    
+
     Returns:
         Normalized text
     """
-    # Order matters: process more specific patterns first
-    # 1. Electronic (email/URL) - very specific patterns
+    # Fast reject: pure Khmer prose (no digits, Latin, symbols) needs none of
+    # the passes below — one linear scan instead of a dozen regex passes
+    if not _NEEDS_NORM_RE.search(text):
+        return text
+
+    # Every numeric pattern needs at least one digit to match, so skip them
+    # all when the text contains none (common for plain prose with some Latin)
+    has_num = len(text.translate(_DIGIT_DROP_TT)) != len(text)
+
+    # More specific patterns come first so they win ties at the same position
+    enabled = []
     if normalize_electronic_flag:
-        text = normalize_electronic(text)
-    
-    # 2. Emoticons - specific patterns
+        enabled += ['email', 'url']
+    if has_num:
+        if normalize_telephone_flag:
+            enabled.append('phone')
+        if normalize_time_flag:
+            enabled.append('time')
+        if normalize_money_flag:
+            enabled += ['money_usd', 'money_khr']
+        if normalize_measure_flag:
+            enabled.append('measure')
+        if normalize_dates or normalize_fractions:
+            enabled.append('datefrac')
+        if normalize_decimals:
+            enabled.append('decimal')
+        if normalize_cardinals:
+            enabled.append('cardinal')
+        elif normalize_digits:
+            enabled.append('digits')
+
+    if enabled:
+        master = _master_re(tuple(enabled))
+
+        def dispatch(match):
+            name = match.lastgroup
+            # datefrac has its own named inner groups, so lastgroup may land
+            # on one of them; the handler reads those groups straight off the
+            # fused match, no component re-match needed
+            if name == 'datefrac' or name.startswith('df_'):
+                out = _replace_date_or_fraction(match, normalize_dates, normalize_fractions)
+                if out is None:
+                    # Not actually a date/fraction: hand the span to the
+                    # general passes
+                    out = _normalize_declined(match.group('datefrac'), normalize_fractions,
+                                              normalize_decimals, normalize_cardinals,
+                                              normalize_digits)
+                return out
+            span = match.group(name)
+            # Re-match with the component pattern so handlers keep their own
+            # group numbering (the fused regex renumbers inner groups)
+            component_match = _COMPONENT_RES[name].match(span)
+            return _MASTER_HANDLERS[name](component_match)
+
+        text = master.sub(dispatch, text)
+
+    # Emoticons are plain string replacements, kept as their own pass
     if normalize_emoticons_flag:
         text = normalize_emoticons(text)
-    
-    # 3. Telephone - before dates (to avoid conflict)
-    if normalize_telephone_flag:
-        text = normalize_telephone(text)
-    
-    # 4. Time - before dates
-    if normalize_time_flag:
-        text = normalize_time(text)
-    
-    # 5. Money - before decimals (money has $ or currency symbols)
-    if normalize_money_flag:
-        text = normalize_money(text)
-    
-    # 6. Measure - before cardinals (has units)
-    if normalize_measure_flag:
-        text = normalize_measure(text)
-    
-    # 7. Fractions and Dates - need careful ordering
-    # Process dates with years first (most specific)
-    # Then fractions
-    # Then dates without years (less specific)
-    if normalize_dates or normalize_fractions:
-        # First, normalize dates with years (DD/MM/YYYY or DD-MM-YYYY with year)
-        year_date_pattern = r'\b(\d{1,2})[/-](\d{1,2})[/-](\d{2,4})\b'
-        def replace_year_date(match):
-            day = int(match.group(1))
-            month = int(match.group(2))
-            year = int(match.group(3))
-            if 1 <= month <= 12 and normalize_dates:
-                day_khmer = number_to_khmer_words(day)
-                month_name = KHMER_MONTHS.get(month, f"ខែ{month}")
-                year_khmer = number_to_khmer_words(year)
-                return f"{day_khmer} ខែ {month_name} ឆ្នាំ {year_khmer}"
-            return match.group(0)
-        text = re.sub(year_date_pattern, replace_year_date, text)
-        
-        # Then normalize fractions - prioritize fractions over dates
-        # Fractions are normalized first, dates only if not already a fraction
-        if normalize_fractions:
-            def replace_fraction_safe(match):
-                numerator = match.group(1)
-                denominator = match.group(2)
-                num_val = int(numerator.lstrip('-'))
-                den_val = int(denominator)
-                # Normalize all as fractions (dates with years already handled above)
-                is_negative = numerator.startswith('-')
-                numerator_khmer = number_to_khmer_words(num_val)
-                denominator_khmer = number_to_khmer_words(den_val)
-                return f"{'ដក ' if is_negative else ''}{numerator_khmer} លើ {denominator_khmer}"
-            fraction_pattern = r'\b(-?\d+)/(\d+)\b(?!\s*[/-]\d)'  # Don't match if followed by another number (date with year)
-            text = re.sub(fraction_pattern, replace_fraction_safe, text)
-        
-        # Finally, normalize dates without years (DD/MM format) that weren't normalized as fractions
-        # Only normalize if it wasn't already processed and looks like a date
-        # Check for date context (words like "date", "ngày", etc.) or if it's clearly a date format
-        if normalize_dates:
-            no_year_date_pattern = r'\b(\d{1,2})[/-](\d{1,2})\b(?!\s*[/-]\d)'
-            def replace_no_year_date(match):
-                # Check if this was already processed as fraction (contains "លើ")
-                if 'លើ' in text[max(0, match.start()-10):match.end()+10]:
-                    return match.group(0)  # Already processed as fraction
-                day = int(match.group(1))
-                month = int(match.group(2))
-                # Check context - look for date-related words nearby
-                context_before = text[max(0, match.start()-20):match.start()].lower()
-                context_after = text[match.end():min(len(text), match.end()+20)].lower()
-                has_date_context = any(word in context_before + context_after for word in ['date', 'ngày', 'day', 'tháng', 'month'])
-                
-                # Only normalize as date if:
-                # 1. Has date context, OR
-                # 2. Day > 12 (unlikely to be numerator of fraction, more likely day of month)
-                if (1 <= month <= 12 and 1 <= day <= 31) and (has_date_context or day > 12):
-                    day_khmer = number_to_khmer_words(day)
-                    month_name = KHMER_MONTHS.get(month, f"ខែ{month}")
-                    return f"{day_khmer} ខែ {month_name}"
-                return match.group(0)
-            text = re.sub(no_year_date_pattern, replace_no_year_date, text)
-    
-    # 9. Decimals - after money and dates
-    if normalize_decimals:
-        text = normalize_decimal(text)
-    
-    # 10. Cardinal numbers should be last (most general)
-    # But we need to be careful not to normalize numbers that are already normalized
-    if normalize_cardinals:
-        text = normalize_cardinal(text)
-    elif normalize_digits:
-        text = normalize_digit(text)
-    
+
     return text
 
 
@@ -10,10 +10,19 @@ Uses lexicon-based longest matching approach with multiple strategies:
 - Bidirectional matching (combines both and resolves conflicts)
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Set, Optional
 import logging
 
+try:  # optional: JIT-compile the hot matching loop when numba is installed
+    import numpy as np
+    from numba import njit
+except ImportError:
+    njit = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -65,6 +74,271 @@ def load_word_set(lexicon_path: Optional[str] = None) -> tuple[Set[str], int]:
 # Global lexicon cache - load once at module import
 _WORD_SET, _MAX_WORD_LEN = load_word_set()
 
+# Sentinel key marking "a word ends at this node" in the trie below
+_TERM = ''
+
+
+def build_trie(words) -> dict:
+    """Build a character trie (nested dicts) over `words`.
+
+    Longest-match then becomes a single left-to-right walk per position
+    instead of one substring slice + set hash per candidate length.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[_TERM] = True
+    return trie
+
+
+def build_reverse_trie(words) -> dict:
+    """Build a trie over the reversed words, for right-to-left matching."""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in reversed(word):
+            node = node.setdefault(ch, {})
+        node[_TERM] = True
+    return trie
+
+
+def _minimize_trie(trie: dict) -> dict:
+    """Merge equivalent subtrees of a nested-dict trie, turning it into a
+    DAWG (minimal acyclic automaton): words sharing a suffix share the tail
+    nodes instead of each keeping a private copy.
+
+    Subtrees are interned bottom-up by their (terminal flag, outgoing edges)
+    signature, which yields the minimal automaton for an acyclic trie. The
+    walkers below are unaffected — shared nodes are just aliased dicts.
+    """
+    registry = {}
+
+    def intern(node):
+        edges = []
+        for ch in sorted(node):
+            if ch != _TERM:
+                node[ch] = intern(node[ch])
+                edges.append((ch, id(node[ch])))
+        key = (_TERM in node, tuple(edges))
+        return registry.setdefault(key, node)
+
+    return intern(trie)
+
+
+_TRIE = _minimize_trie(build_trie(_WORD_SET))
+_RTRIE = _minimize_trie(build_reverse_trie(_WORD_SET))
+
+
+def _trie_for(word_set: Set[str]) -> dict:
+    """Return the prebuilt trie for the module lexicon, or build one for a
+    caller-supplied word set."""
+    if word_set is _WORD_SET:
+        return _TRIE
+    return build_trie(word_set)
+
+
+def _reverse_trie_for(word_set: Set[str]) -> dict:
+    """Reverse-trie counterpart of `_trie_for`."""
+    if word_set is _WORD_SET:
+        return _RTRIE
+    return build_reverse_trie(word_set)
+
+
+def _build_csr(trie):
+    """Flatten a nested-dict trie (or minimized DAWG) into CSR-style arrays
+    for the JIT scan.
+
+    Nodes are numbered breadth-first (root = 0); edges of each node are
+    stored sorted by code point so the scan can binary-search them. Nodes
+    shared between words (DAWG suffix sharing) are emitted once.
+    """
+    nodes = [trie]
+    ids = {id(trie): 0}
+    for node in nodes:  # grows while iterating: breadth-first traversal
+        for ch in node:
+            if ch != _TERM:
+                child = node[ch]
+                if id(child) not in ids:
+                    ids[id(child)] = len(nodes)
+                    nodes.append(child)
+
+    node_start = np.zeros(len(nodes) + 1, dtype=np.int64)
+    is_terminal = np.zeros(len(nodes), dtype=np.bool_)
+    edge_char, edge_target = [], []
+    for i, node in enumerate(nodes):
+        is_terminal[i] = _TERM in node
+        for ch in sorted(ch for ch in node if ch != _TERM):
+            edge_char.append(ord(ch))
+            edge_target.append(ids[id(node[ch])])
+        node_start[i + 1] = len(edge_char)
+    return (node_start, np.asarray(edge_char, dtype=np.int32),
+            np.asarray(edge_target, dtype=np.int32), is_terminal)
+
+
+def _lp_scan(codes, start, end, node_start, edge_char, edge_target, is_terminal):
+    """Walk the DAWG from `start`; returns the end of the longest lexicon
+    word found (last terminal node passed), or -1 when none matches."""
+    node = 0
+    last_term = -1
+    j = start
+    while j < end:
+        c = codes[j]
+        lo = node_start[node]
+        hi = node_start[node + 1]
+        nxt = -1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            ec = edge_char[mid]
+            if ec == c:
+                nxt = edge_target[mid]
+                break
+            elif ec < c:
+                lo = mid + 1
+            else:
+                hi = mid
+        if nxt == -1:
+            break
+        node = nxt
+        j += 1
+        if is_terminal[node]:
+            last_term = j
+    return last_term
+
+
+def _lm_scan(codes, node_start, edge_char, edge_target, is_terminal):
+    """Forward longest-match over code points; returns segment boundaries."""
+    n = codes.shape[0]
+    offsets = np.empty(n + 1, dtype=np.int32)
+    offsets[0] = 0
+    count = 1
+    i = 0
+    while i < n:
+        last_term = _lp_scan(codes, i, n, node_start, edge_char, edge_target,
+                             is_terminal)
+        if last_term != -1:
+            offsets[count] = last_term
+            i = last_term
+        else:
+            offsets[count] = i + 1
+            i += 1
+        count += 1
+    return offsets[:count]
+
+
+def _rlm_scan(codes, node_start, edge_char, edge_target, is_terminal):
+    """Reverse longest-match over code points; returns segment boundaries in
+    descending order (walked over the reverse DAWG)."""
+    n = codes.shape[0]
+    offsets = np.empty(n + 1, dtype=np.int32)
+    offsets[0] = n
+    count = 1
+    i = n
+    while i > 0:
+        node = 0
+        last_term = -1
+        j = i
+        while j > 0:
+            c = codes[j - 1]
+            lo = node_start[node]
+            hi = node_start[node + 1]
+            nxt = -1
+            while lo < hi:
+                mid = (lo + hi) // 2
+                ec = edge_char[mid]
+                if ec == c:
+                    nxt = edge_target[mid]
+                    break
+                elif ec < c:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if nxt == -1:
+                break
+            node = nxt
+            j -= 1
+            if is_terminal[node]:
+                last_term = j
+        if last_term != -1:
+            offsets[count] = last_term
+            i = last_term
+        else:
+            offsets[count] = i - 1
+            i -= 1
+        count += 1
+    return offsets[:count]
+
+
+# Bump when the flattened-array layout changes, so stale caches rebuild
+_CSR_CACHE_VERSION = 1
+
+
+def _load_or_build_csr(trie, lexicon_path, name='cache'):
+    """Return the flattened DAWG arrays, going through an .npz cache stored
+    next to the lexicon TSV.
+
+    The cache is keyed by the TSV's (mtime, size), so a regenerated lexicon
+    transparently rebuilds; on a hit, import loads four flat arrays instead
+    of re-flattening the automaton. `name` separates the forward and reverse
+    automata's cache files.
+    """
+    try:
+        st = os.stat(lexicon_path)
+    except OSError:
+        return _build_csr(trie)
+    sig = np.array([_CSR_CACHE_VERSION, st.st_mtime_ns, st.st_size],
+                   dtype=np.int64)
+    cache_path = f'{lexicon_path}.{name}.npz'
+    try:
+        with np.load(cache_path) as data:
+            if np.array_equal(data['sig'], sig):
+                return (data['node_start'], data['edge_char'],
+                        data['edge_target'], data['is_terminal'])
+    except (OSError, KeyError, ValueError):
+        pass
+
+    csr = _build_csr(trie)
+    node_start, edge_char, edge_target, is_terminal = csr
+    try:
+        np.savez(cache_path, node_start=node_start, edge_char=edge_char,
+                 edge_target=edge_target, is_terminal=is_terminal, sig=sig)
+    except OSError:
+        logger.warning(f"Could not write lexicon cache: {cache_path}")
+    return csr
+
+
+if njit is not None:
+    # nogil lets the forward and reverse scans overlap on two threads in
+    # bidirectional_matching
+    _lp_scan = njit(cache=True, nogil=True)(_lp_scan)
+    _lm_scan = njit(cache=True, nogil=True)(_lm_scan)
+    _rlm_scan = njit(cache=True, nogil=True)(_rlm_scan)
+    _CSR = _load_or_build_csr(_TRIE, _default_lexicon_path())
+    _RCSR = _load_or_build_csr(_RTRIE, _default_lexicon_path(), name='rcache')
+else:
+    _CSR = None
+    _RCSR = None
+
+
+def _encode_codes(text: str):
+    """uint32 view of the text (utf-32-le has no BOM) as an int32 array for
+    the JIT scans."""
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.int32)
+
+
+# Below this many characters the two scans are cheaper run back-to-back than
+# through a thread pool
+_PARALLEL_MIN_CHARS = 4096
+
+
+def _segments_from_reverse_offsets(text: str, offsets) -> List[str]:
+    """Slice `text` on the descending boundaries emitted by `_rlm_scan`,
+    returned in left-to-right order."""
+    result = [text[offsets[k + 1]:offsets[k]] for k in range(len(offsets) - 1)]
+    result.reverse()
+    return result
+
 
 def longest_matching(text: str, word_set: Set[str], max_word_len: int) -> List[str]:
     """Segment text using forward longest matching (greedy left-to-right).
@@ -86,30 +360,37 @@ def longest_matching(text: str, word_set: Set[str], max_word_len: int) -> List[s
     """
     if not text:
         return []
-    
+
+    if _CSR is not None and word_set is _WORD_SET:
+        offsets = _lm_scan(_encode_codes(text), *_CSR)
+        return [text[offsets[k]:offsets[k + 1]] for k in range(len(offsets) - 1)]
+
+    trie = _trie_for(word_set)
     result = []
     i = 0
     text_len = len(text)
-    
+
     while i < text_len:
-        # Try to match longest word first
-        matched = False
-        # Limit search to max_word_len or remaining text
-        max_try = min(max_word_len, text_len - i)
-        
-        for length in range(max_try, 0, -1):
-            candidate = text[i:i+length]
-            if candidate in word_set:
-                result.append(candidate)
-                i += length
-                matched = True
+        # Walk the trie forward, remembering the deepest word end seen
+        node = trie
+        last_term = -1
+        j = i
+        while j < text_len:
+            node = node.get(text[j])
+            if node is None:
                 break
-        
-        # If no match, take single character
-        if not matched:
+            j += 1
+            if _TERM in node:
+                last_term = j
+
+        if last_term != -1:
+            result.append(text[i:last_term])
+            i = last_term
+        else:
+            # If no match, take single character
             result.append(text[i])
             i += 1
-    
+
     return result
 
 
@@ -129,28 +410,39 @@ def reverse_longest_matching(text: str, word_set: Set[str], max_word_len: int) -
     """
     if not text:
         return []
-    
+
+    if _RCSR is not None and word_set is _WORD_SET:
+        offsets = _rlm_scan(_encode_codes(text), *_RCSR)
+        return _segments_from_reverse_offsets(text, offsets)
+
+    trie = _reverse_trie_for(word_set)
     result = []
     i = len(text)
-    
+
     while i > 0:
-        matched = False
-        # Try to match longest word first (going backwards)
-        max_try = min(max_word_len, i)
-        
-        for length in range(max_try, 0, -1):
-            candidate = text[i-length:i]
-            if candidate in word_set:
-                result.insert(0, candidate)
-                i -= length
-                matched = True
+        # Walk the reverse trie leftwards, remembering the deepest word start
+        node = trie
+        last_term = -1
+        j = i
+        while j > 0:
+            node = node.get(text[j - 1])
+            if node is None:
                 break
-        
-        # If no match, take single character
-        if not matched:
-            result.insert(0, text[i-1])
+            j -= 1
+            if _TERM in node:
+                last_term = j
+
+        if last_term != -1:
+            result.append(text[last_term:i])
+            i = last_term
+        else:
+            # If no match, take single character
+            result.append(text[i-1])
             i -= 1
-    
+
+    # segments were collected right-to-left; one O(n) reversal instead of
+    # an O(n) memmove per insert(0, ...)
+    result.reverse()
     return result
 
 
@@ -162,8 +454,7 @@ def bidirectional_matching(text: str, word_set: Set[str], max_word_len: int) ->
     2. If results are the same, return immediately
     3. If different, use heuristics to choose better segmentation:
        - Fewer segments (fewer words) is often better
-       - Longer words are preferred over shorter ones
-       - If still tied, prefer forward matching
+       - If tied, prefer forward matching
     
     Args:
         text: Input text without spaces
@@ -175,10 +466,25 @@ def bidirectional_matching(text: str, word_set: Set[str], max_word_len: int) ->
     """
     if not text:
         return []
-    
-    # Get both segmentations
-    forward = longest_matching(text, word_set, max_word_len)
-    reverse = reverse_longest_matching(text, word_set, max_word_len)
+
+    # Get both segmentations — on the JIT path the text is encoded once and
+    # shared, and long inputs run the two nogil scans on parallel threads
+    if _CSR is not None and word_set is _WORD_SET:
+        codes = _encode_codes(text)
+        if len(codes) >= _PARALLEL_MIN_CHARS:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                forward_future = pool.submit(_lm_scan, codes, *_CSR)
+                reverse_offsets = _rlm_scan(codes, *_RCSR)
+                forward_offsets = forward_future.result()
+        else:
+            forward_offsets = _lm_scan(codes, *_CSR)
+            reverse_offsets = _rlm_scan(codes, *_RCSR)
+        forward = [text[forward_offsets[k]:forward_offsets[k + 1]]
+                   for k in range(len(forward_offsets) - 1)]
+        reverse = _segments_from_reverse_offsets(text, reverse_offsets)
+    else:
+        forward = longest_matching(text, word_set, max_word_len)
+        reverse = reverse_longest_matching(text, word_set, max_word_len)
     
     # If they agree, use either
     if forward == reverse:
@@ -186,24 +492,39 @@ def bidirectional_matching(text: str, word_set: Set[str], max_word_len: int) ->
     
     # Choose based on heuristics
     # Prefer fewer segments (longer words)
-    if len(forward) < len(reverse):
-        return forward
-    elif len(reverse) < len(forward):
-        return reverse
-    
-    # If same number of segments, prefer longer average word length
-    forward_avg_len = sum(len(w) for w in forward) / len(forward)
-    reverse_avg_len = sum(len(w) for w in reverse) / len(reverse)
-    
-    if forward_avg_len > reverse_avg_len:
-        return forward
-    elif reverse_avg_len > forward_avg_len:
+    if len(reverse) < len(forward):
         return reverse
-    
-    # Still tied? Default to forward
+
+    # Equal counts can't be split by average word length — both lists cover
+    # the same text, so the averages are identical. Default to forward.
     return forward
 
 
+def _segment_once(text: str, method: str, word_set: Set[str], max_word_len: int) -> str:
+    """Run one segmentation method over already-despaced text."""
+    if method == 'forward':
+        words = longest_matching(text, word_set, max_word_len)
+    elif method == 'reverse':
+        words = reverse_longest_matching(text, word_set, max_word_len)
+    elif method == 'bidirectional':
+        words = bidirectional_matching(text, word_set, max_word_len)
+    else:
+        raise ValueError(f"Unknown method: {method}. Use 'forward', 'reverse', or 'bidirectional'")
+
+    # Join with spaces
+    return ' '.join(words)
+
+
+# TTS pipelines re-segment the same short prompts a lot; memoize them. Only
+# texts under _CACHE_MAX_CHARS go through here, which bounds cache memory
+_CACHE_MAX_CHARS = 256
+
+
+@lru_cache(maxsize=1024)
+def _segment_cached(text: str, method: str) -> str:
+    return _segment_once(text, method, _WORD_SET, _MAX_WORD_LEN)
+
+
 def segment_khmer_text(
     text: str,
     method: str = 'bidirectional',
@@ -212,33 +533,29 @@ def segment_khmer_text(
 ) -> str:
     if not text or not text.strip():
         return text
-    
+
+    # Pure-ASCII input has nothing the Khmer lexicon could match; splitting
+    # it into single characters would only mangle it
+    if text.isascii():
+        return text
+
     # Remove existing spaces for clean segmentation
     text = text.replace(' ', '')
-    
+
     # Use global cache if not provided
     if word_set is None:
         word_set = _WORD_SET
     if max_word_len is None:
         max_word_len = _MAX_WORD_LEN
-    
+
     # Check if lexicon is loaded
     if not word_set:
         logger.warning("Word set is empty, returning original text")
         return text
-    
-    # Apply selected method
-    if method == 'forward':
-        words = longest_matching(text, word_set, max_word_len)
-    elif method == 'reverse':
-        words = reverse_longest_matching(text, word_set, max_word_len)
-    elif method == 'bidirectional':
-        words = bidirectional_matching(text, word_set, max_word_len)
-    else:
-        raise ValueError(f"Unknown method: {method}. Use 'forward', 'reverse', or 'bidirectional'")
-    
-    # Join with spaces
-    return ' '.join(words)
+
+    if word_set is _WORD_SET and len(text) < _CACHE_MAX_CHARS:
+        return _segment_cached(text, method)
+    return _segment_once(text, method, word_set, max_word_len)
 
 
 # Convenience aliases
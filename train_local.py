@@ -1,11 +1,24 @@
 import os
+import io
 import re
+import glob
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
 import torch
-from torch.utils.data import DataLoader
+import torch.distributed as dist
+from torch.nn.parallel import DistributedDataParallel as DDP
+from torch.utils.data import DataLoader, DistributedSampler
 from tensorboardX import SummaryWriter
 
+try:
+    from safetensors.torch import save_file as save_safetensors, load_file as load_safetensors
+except ImportError:
+    save_safetensors = load_safetensors = None
+
 from datas.dataset import StableDataset, collate_fn
+from datas.sampler import LengthBucketSampler
 from text import symbols
 from config import MelConfig, ModelConfig, TrainConfig
 from models.model import StableTTS
@@ -21,6 +34,14 @@ def parse_args():
     p.add_argument('--save-dir', type=str, default=None)
     p.add_argument('--resume-from', type=str, default=None, help='Path to model checkpoint .pt')
     p.add_argument('--optimizer-path', type=str, default=None, help='Path to optimizer state .pt')
+    p.add_argument('--grad-accum-steps', type=int, default=1,
+                   help='Micro-batches per optimizer step (gradients sync only on the last one)')
+    p.add_argument('--amp', choices=['off', 'bf16', 'fp16'], default='off',
+                   help='Mixed-precision forward: bf16 (no scaler needed) or fp16 (with GradScaler)')
+    p.add_argument('--num-workers', type=int, default=min(os.cpu_count() or 1, 8),
+                   help='DataLoader worker processes')
+    p.add_argument('--compile', action='store_true',
+                   help='torch.compile the model (fused kernels, lower launch overhead)')
     return p.parse_args()
 
 
@@ -30,10 +51,117 @@ def extract_step_from_name(path: str):
     return int(m.group(1)) if m else 0
 
 
+class CUDAPrefetcher:
+    """Copies the next batch to the device on a side stream so the H2D
+    transfer overlaps the current step's compute instead of queueing behind
+    it on the default stream. Falls back to plain synchronous moves on CPU."""
+
+    def __init__(self, loader, device):
+        self.loader = loader
+        self.device = device
+        self.stream = torch.cuda.Stream(device) if device.type == 'cuda' else None
+
+    def _preload(self, it):
+        try:
+            batch = next(it)
+        except StopIteration:
+            return None
+        with torch.cuda.stream(self.stream):
+            return [d.to(self.device, non_blocking=True) for d in batch]
+
+    def __iter__(self):
+        if self.stream is None:
+            for batch in self.loader:
+                yield [d.to(self.device) for d in batch]
+            return
+        it = iter(self.loader)
+        batch = self._preload(it)
+        while batch is not None:
+            current = torch.cuda.current_stream(self.device)
+            current.wait_stream(self.stream)
+            # the side stream may not reuse this memory until the compute
+            # stream is done with it
+            for d in batch:
+                d.record_stream(current)
+            next_batch = self._preload(it)
+            yield batch
+            batch = next_batch
+
+
+def stage_to_cpu(obj):
+    """Deep-copy a (possibly nested) state dict to CPU so the training step
+    can move on while a background thread writes it to disk."""
+    if torch.is_tensor(obj):
+        return obj.detach().to('cpu', non_blocking=True)
+    if isinstance(obj, dict):
+        return {k: stage_to_cpu(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(stage_to_cpu(v) for v in obj)
+    return obj
+
+
+def write_checkpoint(model_sd, opt_sd, ckpt_path, opt_path, save_dir, step):
+    """Persist staged state dicts and prune old checkpoints.
+
+    Runs on the saver thread. Each file is serialized to memory first and
+    flushed with a single write() to keep syscalls off the critical path.
+    """
+    if ckpt_path.endswith('.safetensors'):
+        # one contiguous write per file, and the load side can mmap it
+        save_safetensors({k: v.contiguous() for k, v in model_sd.items()}, ckpt_path)
+        pending = ((opt_sd, opt_path),)
+    else:
+        pending = ((model_sd, ckpt_path), (opt_sd, opt_path))
+    for state_dict, path in pending:
+        buffer = io.BytesIO()
+        torch.save(state_dict, buffer)
+        with open(path, 'wb') as f:
+            f.write(buffer.getbuffer())
+    print(f"💾 Saved checkpoint at step {step}")
+
+    # Auto cleanup: keep 5 latest checkpoints
+    ckpts = sorted(
+        glob.glob(os.path.join(save_dir, "checkpoint_step_*")),
+        key=os.path.getmtime
+    )
+    if len(ckpts) > 5:
+        for old_ckpt in ckpts[:-5]:
+            try:
+                os.remove(old_ckpt)
+                opt_ckpt = old_ckpt.replace("checkpoint", "optimizer")
+                if opt_ckpt.endswith('.safetensors'):
+                    opt_ckpt = opt_ckpt[:-len('safetensors')] + 'pt'
+                if os.path.exists(opt_ckpt):
+                    os.remove(opt_ckpt)
+                print(f"🧹 Removed old checkpoint: {old_ckpt}")
+            except Exception as e:
+                print(f"⚠️ Could not remove {old_ckpt}: {e}")
+
+
 def main():
     args = parse_args()
 
-    device = torch.device(args.device)
+    # TF32 tensor cores for fp32 matmul/conv (Ampere+), and let cuDNN
+    # autotune conv algorithms — bucket sampling keeps shapes stable enough
+    # for the benchmark cache to pay off
+    torch.backends.cuda.matmul.allow_tf32 = True
+    torch.backends.cudnn.allow_tf32 = True
+    torch.backends.cudnn.benchmark = True
+    torch.set_float32_matmul_precision('high')
+
+    # Launched via torchrun? Bootstrap DDP from its environment variables;
+    # otherwise stay single-process exactly as before
+    distributed = int(os.environ.get('WORLD_SIZE', 1)) > 1
+    if distributed:
+        dist.init_process_group(backend='gloo' if os.name == 'nt' else 'nccl')
+        local_rank = int(os.environ['LOCAL_RANK'])
+        torch.cuda.set_device(local_rank)
+        device = torch.device('cuda', local_rank)
+        rank = dist.get_rank()
+    else:
+        device = torch.device(args.device)
+        rank = 0
+
     mel_config = MelConfig()
     model_config = ModelConfig()
     train_config = TrainConfig()
@@ -45,11 +173,28 @@ def main():
 
     # Dataset / Loader
     dataset = StableDataset(train_config.train_dataset_path, mel_config.hop_length)
-    loader = DataLoader(dataset, batch_size=train_config.batch_size, shuffle=True,
-                        collate_fn=collate_fn, num_workers=4, pin_memory=True)
+    # persistent workers survive across epochs instead of being respawned;
+    # prefetch_factor is per worker, so the buffer scales with num_workers
+    loader_kwargs = dict(collate_fn=collate_fn, num_workers=args.num_workers, pin_memory=True,
+                         persistent_workers=args.num_workers > 0,
+                         prefetch_factor=4 if args.num_workers > 0 else None)
+    if distributed:
+        sampler = DistributedSampler(dataset)
+        loader = DataLoader(dataset, batch_size=train_config.batch_size, sampler=sampler,
+                            drop_last=True, **loader_kwargs)
+    else:
+        # bucket similar mel lengths per batch so padding stays small
+        sampler = LengthBucketSampler(dataset.lengths, train_config.batch_size)
+        loader = DataLoader(dataset, batch_sampler=sampler, **loader_kwargs)
 
     model = StableTTS(len(symbols), mel_config.n_mels, **asdict(model_config)).to(device)
-    optimizer = torch.optim.AdamW(model.parameters(), lr=train_config.learning_rate)
+    # fused AdamW updates a whole param group in one kernel; fall back to the
+    # multi-tensor foreach path where the fused kernel is unavailable
+    try:
+        optimizer = torch.optim.AdamW(model.parameters(), lr=train_config.learning_rate,
+                                      fused=device.type == 'cuda')
+    except (RuntimeError, ValueError):
+        optimizer = torch.optim.AdamW(model.parameters(), lr=train_config.learning_rate, foreach=True)
     scheduler = get_cosine_schedule_with_warmup(
         optimizer,
         num_warmup_steps=int(train_config.warmup_steps),
@@ -61,12 +206,17 @@ def main():
     if args.resume_from:
         ckpt_path = args.resume_from
         print(f"✅ Resuming model from: {ckpt_path}")
-        model.load_state_dict(torch.load(ckpt_path, map_location=device))
+        if ckpt_path.endswith('.safetensors'):
+            model.load_state_dict(load_safetensors(ckpt_path, device=str(device)))
+        else:
+            model.load_state_dict(torch.load(ckpt_path, map_location=device))
 
         if args.optimizer_path:
             opt_path = args.optimizer_path
         else:
             opt_path = ckpt_path.replace("checkpoint", "optimizer")
+            if opt_path.endswith('.safetensors'):
+                opt_path = opt_path[:-len('safetensors')] + 'pt'
 
         if os.path.exists(opt_path):
             optimizer.load_state_dict(torch.load(opt_path, map_location=device))
@@ -81,64 +231,111 @@ def main():
         continue_training(train_config.model_save_path, model, optimizer)
     # ==================================================
 
-    writer = SummaryWriter(train_config.log_dir)
+    raw_model = model  # un-compiled, un-wrapped module: checkpoints keep clean keys
+    if args.compile:
+        try:
+            # dynamic left to autodetect: batches are padded to per-batch max
+            # lengths, so fixing static shapes would recompile constantly
+            model = torch.compile(model, mode='reduce-overhead', fullgraph=False)
+        except Exception as e:
+            print(f"⚠️ torch.compile unavailable, running eager: {e}")
+    if distributed:
+        model = DDP(model, device_ids=[local_rank], gradient_as_bucket_view=True, static_graph=True)
+
+    writer = SummaryWriter(train_config.log_dir) if rank == 0 else None
+    grad_accum_steps = max(1, args.grad_accum_steps)
+    log_every = train_config.log_interval
+    save_every = train_config.save_interval * len(loader)
+
+    # bf16 keeps the fp32 exponent range, so only fp16 needs loss scaling;
+    # with enabled=False the scaler calls below are pass-throughs
+    amp_dtype = {'bf16': torch.bfloat16, 'fp16': torch.float16}.get(args.amp)
+    scaler = torch.cuda.amp.GradScaler(enabled=args.amp == 'fp16')
+
+    # Checkpoint writes run on this single-worker pool so the training loop
+    # never stalls on disk I/O; at most one save is in flight at a time
+    saver = ThreadPoolExecutor(max_workers=1)
+    pending_save = None
 
     try:
         model.train()
+        epoch = 0
+        optimizer.zero_grad(set_to_none=True)
+        # losses accumulate on-device; .item()/.tolist() would force a
+        # GPU→CPU sync every step, so scalars only cross at log boundaries
+        loss_acc = torch.zeros(3, device=device)
+        loss_count = 0
         while True:
-            for batch_idx, datas in enumerate(loader):
-                datas = [d.to(device, non_blocking=True) for d in datas]
+            sampler.set_epoch(epoch)
+            for batch_idx, datas in enumerate(CUDAPrefetcher(loader, device)):
                 x, x_lengths, y, y_lengths, z, z_lengths = datas
 
-                optimizer.zero_grad()
-                dur_loss, diff_loss, prior_loss, _ = model(x, x_lengths, y, y_lengths, z, z_lengths)
-                loss = dur_loss + diff_loss + prior_loss
-                loss.backward()
-                optimizer.step()
+                is_sync_step = (batch_idx + 1) % grad_accum_steps == 0
+                # no_sync must cover forward too — DDP arms its gradient
+                # hooks during forward, not backward
+                sync_ctx = model.no_sync() if distributed and not is_sync_step else nullcontext()
+                # autocast covers the forward only — backward picks up the
+                # right dtypes from the autograd graph
+                amp_ctx = torch.autocast(device.type, dtype=amp_dtype) if amp_dtype is not None else nullcontext()
+                with sync_ctx:
+                    with amp_ctx:
+                        dur_loss, diff_loss, prior_loss, _ = model(x, x_lengths, y, y_lengths, z, z_lengths)
+                        loss = dur_loss + diff_loss + prior_loss
+                    scaler.scale(loss / grad_accum_steps).backward()
+
+                loss_acc += torch.stack([dur_loss.detach(), diff_loss.detach(), prior_loss.detach()])
+                loss_count += 1
+
+                if not is_sync_step:
+                    continue
+
+                scaler.step(optimizer)
+                scaler.update()
                 scheduler.step()
+                optimizer.zero_grad(set_to_none=True)
 
-                # 🟢 Ghi log TensorBoard
-                if step % train_config.log_interval == 0:
-                    writer.add_scalar('training/diff_loss', diff_loss.item(), step)
-                    writer.add_scalar('training/dur_loss', dur_loss.item(), step)
-                    writer.add_scalar('training/prior_loss', prior_loss.item(), step)
-                    print(f"[Step {step}] diff={diff_loss.item():.4f}, dur={dur_loss.item():.4f}, prior={prior_loss.item():.4f}, total={loss.item():.4f}")
+                # 🟢 Ghi log TensorBoard (trung bình từ lần ghi log trước)
+                if rank == 0 and step > 0 and step % log_every == 0 and loss_count:
+                    dur_avg, diff_avg, prior_avg = (loss_acc / loss_count).tolist()
+                    loss_acc.zero_()
+                    loss_count = 0
+                    writer.add_scalar('training/diff_loss', diff_avg, step)
+                    writer.add_scalar('training/dur_loss', dur_avg, step)
+                    writer.add_scalar('training/prior_loss', prior_avg, step)
+                    print(f"[Step {step}] diff={diff_avg:.4f}, dur={dur_avg:.4f}, prior={prior_avg:.4f}, total={dur_avg + diff_avg + prior_avg:.4f}")
 
-                # 💾 Lưu checkpoint định kỳ
-                if step % (train_config.save_interval * len(loader)) == 0:
-                    ckpt_path = os.path.join(train_config.model_save_path, f'checkpoint_step_{step}.pt')
+                # 💾 Lưu checkpoint định kỳ (ghi đĩa chạy nền)
+                # step > 0: không lưu lại ngay tại bước đầu của mỗi lần resume
+                if rank == 0 and step > 0 and step % save_every == 0:
+                    ckpt_ext = 'safetensors' if save_safetensors is not None else 'pt'
+                    ckpt_path = os.path.join(train_config.model_save_path, f'checkpoint_step_{step}.{ckpt_ext}')
                     opt_path = os.path.join(train_config.model_save_path, f'optimizer_step_{step}.pt')
-                    torch.save(model.state_dict(), ckpt_path)
-                    torch.save(optimizer.state_dict(), opt_path)
-                    print(f"💾 Saved checkpoint at step {step}")
-
-                    # Auto cleanup: keep 5 latest checkpoints
-                    import glob
-                    ckpts = sorted(
-                        glob.glob(os.path.join(train_config.model_save_path, "checkpoint_step_*.pt")),
-                        key=os.path.getmtime
-                    )
-                    if len(ckpts) > 5:
-                        for old_ckpt in ckpts[:-5]:
-                            try:
-                                os.remove(old_ckpt)
-                                opt_ckpt = old_ckpt.replace("checkpoint", "optimizer")
-                                if os.path.exists(opt_ckpt):
-                                    os.remove(opt_ckpt)
-                                print(f"🧹 Removed old checkpoint: {old_ckpt}")
-                            except Exception as e:
-                                print(f"⚠️ Could not remove {old_ckpt}: {e}")
+                    if pending_save is not None:
+                        pending_save.result()  # one staged copy at a time
+                    model_sd = stage_to_cpu(raw_model.state_dict())
+                    opt_sd = stage_to_cpu(optimizer.state_dict())
+                    if device.type == 'cuda':
+                        torch.cuda.synchronize(device)  # staged copies must land before the write
+                    pending_save = saver.submit(write_checkpoint, model_sd, opt_sd,
+                                                ckpt_path, opt_path,
+                                                train_config.model_save_path, step)
 
                 step += 1
                 if args.max_steps and step >= args.max_steps:
                     print('✅ Reached max-steps, exiting.')
                     return
 
-            print(f"📘 Epoch finished — current step={step}, last loss={loss.item():.4f}")
+            epoch += 1
+            print(f"📘 Epoch finished — current step={step}")
 
     except KeyboardInterrupt:
         print('⛔ Interrupted — saving model...')
-        torch.save(model.state_dict(), os.path.join(train_config.model_save_path, f'checkpoint_interrupt.pt'))
+        if rank == 0:
+            torch.save(raw_model.state_dict(), os.path.join(train_config.model_save_path, f'checkpoint_interrupt.pt'))
+    finally:
+        saver.shutdown(wait=True)  # flush any in-flight checkpoint write
+        if distributed:
+            dist.destroy_process_group()
 
 
 if __name__ == '__main__':
@@ -1,32 +1,10 @@
+import functools
+import os
+
 import torch
 from torch import Tensor
 import torch.nn as nn
 import torchaudio
-import soundfile as sf
-import os
-
-class LinearSpectrogram(nn.Module):
-    def __init__(self, n_fft, win_length, hop_length, pad, center, pad_mode):
-        super().__init__()
-
-        self.n_fft = n_fft
-        self.win_length = win_length
-        self.hop_length = hop_length
-        self.pad = pad
-        self.center = center
-        self.pad_mode = pad_mode
-        
-        self.register_buffer("window", torch.hann_window(win_length))
-
-    def forward(self, waveform: Tensor) -> Tensor:
-        if waveform.ndim == 3:
-            waveform = waveform.squeeze(1)
-        waveform = torch.nn.functional.pad(waveform.unsqueeze(1), (self.pad, self.pad), self.pad_mode).squeeze(1)
-        spec = torch.stft(waveform, self.n_fft, self.hop_length, self.win_length, self.window, self.center, self.pad_mode, False, True, True)
-        spec = torch.view_as_real(spec)
-        spec = torch.sqrt(spec.pow(2).sum(-1) + 1e-6)
-        return spec
-
 
 class LogMelSpectrogram(nn.Module):
     def __init__(self, sample_rate, n_fft, win_length, hop_length, f_min, f_max, pad, n_mels, center, pad_mode, mel_scale):
@@ -42,9 +20,13 @@ class LogMelSpectrogram(nn.Module):
         self.center = center
         self.pad_mode = pad_mode
         self.mel_scale = mel_scale
-        
-        self.spectrogram = LinearSpectrogram(n_fft, win_length, hop_length, pad, center, pad_mode)
-        self.mel_scale = torchaudio.transforms.MelScale(n_mels, sample_rate, f_min, f_max, (n_fft//2)+1, mel_scale, mel_scale)
+
+        # derived from config, so neither buffer belongs in checkpoints
+        # (and DDP then skips broadcasting them at init)
+        self.register_buffer("window", torch.hann_window(win_length), persistent=False)
+        # precomputed filterbank: one matmul per call instead of going
+        # through a MelScale submodule
+        self.register_buffer("fb", torchaudio.functional.melscale_fbanks((n_fft // 2) + 1, f_min, f_max, n_mels, sample_rate, mel_scale, mel_scale), persistent=False)
 
     def compress(self, x: Tensor) -> Tensor:
         return torch.log(torch.clamp(x, min=1e-5))
@@ -53,10 +35,17 @@ class LogMelSpectrogram(nn.Module):
         return torch.exp(x)
 
     def forward(self, x: Tensor) -> Tensor:
-        linear_spec = self.spectrogram(x)
-        x = self.mel_scale(linear_spec)
-        x = self.compress(x)
-        return x
+        if x.ndim == 3:
+            x = x.squeeze(1)
+        # reflect pad1d takes [B, T] directly, no need to bounce through 3D
+        x = torch.nn.functional.pad(x, (self.pad, self.pad), self.pad_mode)
+        spec = torch.view_as_real(torch.stft(x, self.n_fft, self.hop_length, self.win_length, self.window, self.center, self.pad_mode, False, True, True))
+        # amplitude has to be taken before the mel matmul: the filterbank
+        # mixes bins, so folding the sqrt into the log would change the
+        # feature definition (and invalidate existing mels/checkpoints)
+        spec = torch.sqrt(spec[..., 0].square() + spec[..., 1].square() + 1e-6)
+        mel = torch.matmul(self.fb.transpose(-1, -2), spec)
+        return self.compress(mel)
     
 def load_and_resample_audio(audio_path, target_sr, device='cpu'):
     if not os.path.exists(audio_path):
@@ -64,22 +53,31 @@ def load_and_resample_audio(audio_path, target_sr, device='cpu'):
         return None
 
     try:
-        # ⚙️ Dùng soundfile thay vì torchaudio.load để tránh TorchCodec
-        y, sr = sf.read(audio_path, always_2d=True)
-        y = torch.from_numpy(y.T).float()  # [C, T]
-        print(f"[INFO] Loaded audio via soundfile: {audio_path}, sr={sr}, shape={y.shape}")
+        # ⚙️ backend='soundfile' giải mã thẳng ra tensor float32 [C, T]
+        # (vẫn tránh TorchCodec, và bỏ được bước copy qua NumPy)
+        y, sr = torchaudio.load(audio_path, backend='soundfile')
+        print(f"[INFO] Loaded audio via torchaudio: {audio_path}, sr={sr}, shape={y.shape}")
     except Exception as e:
         print(f"[ERROR] Cannot load audio: {audio_path}\n{e}")
         return None
 
-    y = y.to(device)
-
-    # 🔉 Convert stereo → mono
+    # 🔉 Convert stereo → mono (trên CPU, trước khi copy sang device —
+    # file mono không tốn gì, file stereo chỉ chuyển 1 kênh qua PCIe)
     if y.size(0) > 1:
         y = y.mean(dim=0, keepdim=True)
 
+    y = y.to(device)
+
     # 🔁 Resample nếu tần số không trùng
     if sr != target_sr:
-        y = torchaudio.functional.resample(y, sr, target_sr)
+        y = _resampler(int(sr), int(target_sr)).to(y.device)(y)
 
     return y
+
+
+@functools.lru_cache(maxsize=None)
+def _resampler(orig_sr: int, target_sr: int) -> torchaudio.transforms.Resample:
+    """One Resample transform per (src, dst) rate pair — the sinc kernel is
+    precomputed once instead of being rebuilt on every call like
+    torchaudio.functional.resample does."""
+    return torchaudio.transforms.Resample(orig_sr, target_sr)
@@ -1,8 +1,18 @@
 import os
+import re
 import torch
 import torch.nn as nn
 import torch.optim as optim
 
+try:
+    from safetensors.torch import load_file as _load_safetensors
+except ImportError:
+    _load_safetensors = None
+
+# Hỗ trợ cả dạng checkpoint_step_123.pt hoặc checkpoint_123.pt
+# (model có thể được lưu .safetensors, optimizer luôn là .pt)
+_CKPT_RE = re.compile(r"^(checkpoint|optimizer)(?:_step)?_(\d+)\.(?:pt|safetensors)$")
+
 def continue_training(checkpoint_path, model: nn.Module, optimizer: optim.Optimizer, steps_per_epoch: int = None, target_step: int = None) -> int:
     """
     Resume training from the latest checkpoint (supports both epoch-based and step-based saving).
@@ -22,30 +32,23 @@ def continue_training(checkpoint_path, model: nn.Module, optimizer: optim.Optimi
     optim_files = {}
 
     # === 1️⃣ Duyệt qua tất cả checkpoint ===
-    for f in os.listdir(checkpoint_path):
-        if not f.endswith(".pt"):
-            continue
-
-        if "interrupt" in f or "best" in f:
-            print(f"[WARN] Skipping invalid checkpoint: {f}")
-            continue
-
-        # Hỗ trợ cả dạng checkpoint_step_123.pt hoặc checkpoint_123.pt
-        num_str = None
-        if "_step_" in f:
-            num_str = f.split("_step_")[-1].split(".")[0]
-        elif "_" in f:
-            num_str = f.split("_")[-1].split(".")[0]
-
-        if num_str is None or not num_str.isdigit():
-            print(f"[WARN] Skipping unrecognized file: {f}")
-            continue
-
-        step = int(num_str)
-        if f.startswith("checkpoint"):
-            model_files[step] = f
-        elif f.startswith("optimizer"):
-            optim_files[step] = f
+    # scandir + một regex biên dịch sẵn: một lần duyệt, không stat() thêm
+    # cho từng file (đáng kể trên thư mục checkpoint nằm trên NFS)
+    with os.scandir(checkpoint_path) as entries:
+        for entry in entries:
+            m = _CKPT_RE.match(entry.name)
+            if m is None:
+                if entry.name.endswith(".pt"):
+                    print(f"[WARN] Skipping unrecognized file: {entry.name}")
+                continue
+            if entry.name.endswith(".safetensors") and _load_safetensors is None:
+                print(f"[WARN] safetensors not installed, skipping: {entry.name}")
+                continue
+            step = int(m.group(2))
+            if m.group(1) == "checkpoint":
+                model_files[step] = entry.name
+            else:
+                optim_files[step] = entry.name
 
     # === 2️⃣ Kiểm tra xem có cặp checkpoint hợp lệ không ===
     common_steps = set(model_files.keys()) & set(optim_files.keys())
@@ -65,15 +68,25 @@ def continue_training(checkpoint_path, model: nn.Module, optimizer: optim.Optimi
     optim_file = os.path.join(checkpoint_path, optim_files[load_step])
 
     # === 4️⃣ Load model và optimizer ===
+    # mmap=True: trang của file được nạp theo nhu cầu thay vì đọc toàn bộ
+    # checkpoint vào RAM trước khi copy sang GPU
     print(f"✅  Resuming training from checkpoint: step {load_step}")
-    state_dict = torch.load(model_file, map_location="cpu")
+    if model_file.endswith(".safetensors"):
+        state_dict = _load_safetensors(model_file)
+    else:
+        state_dict = torch.load(model_file, map_location="cpu", mmap=True, weights_only=True)
 
     if hasattr(model, "module"):
         model.module.load_state_dict(state_dict)
     else:
         model.load_state_dict(state_dict)
 
-    optimizer.load_state_dict(torch.load(optim_file, map_location="cpu"))
+    try:
+        optim_state = torch.load(optim_file, map_location="cpu", mmap=True, weights_only=True)
+    except Exception:
+        # optimizer cũ có thể chứa object ngoài danh sách weights_only
+        optim_state = torch.load(optim_file, map_location="cpu")
+    optimizer.load_state_dict(optim_state)
 
     # === 5️⃣ Quy đổi step -> epoch nếu có steps_per_epoch ===
     if steps_per_epoch:
@@ -19,6 +19,7 @@ from dataset import VocosDataset
 from models.discriminator import MultiPeriodDiscriminator, MultiResolutionDiscriminator
 from models.loss import feature_loss, generator_loss, discriminator_loss, MultiScaleMelSpectrogramLoss, SingleScaleMelSpectrogramLoss
 from config import MelConfig, VocosConfig, TrainConfig
+from utils.audio import LogMelSpectrogram
 from utils.scheduler import get_cosine_schedule_with_warmup
 from utils.load import continue_training
 
@@ -54,6 +55,9 @@ def train(rank, world_size):
     mpd = MultiPeriodDiscriminator().to(rank)
     mrd = MultiResolutionDiscriminator().to(rank)
     loss_fn = MultiScaleMelSpectrogramLoss().to(rank)
+    # one batched mel transform on the GPU instead of per-item CPU mels in the
+    # dataloader workers, so the workers only decode and slice audio
+    mel_extractor = LogMelSpectrogram(**asdict(mel_config)).to(rank)
     if rank == 0:
         print(f"Generator params: {sum(p.numel() for p in generator.parameters()) / 1e6}")
         print(f"Discriminator mpd params: {sum(p.numel() for p in mpd.parameters()) / 1e6}")
@@ -89,9 +93,10 @@ def train(rank, world_size):
         else:
             dataloader = train_dataloader
             
-        for batch_idx, datas in enumerate(dataloader):
-            datas = [data.to(rank, non_blocking=True) for data in datas]
-            audios, mels = datas
+        for batch_idx, audios in enumerate(dataloader):
+            audios = audios.to(rank, non_blocking=True) # shape: [batch_size, 1, segment_size]
+            with torch.no_grad():
+                mels = mel_extractor(audios) # shape: [batch_size, n_mels, segment_size // hop_length]
             audios_fake = generator(mels).unsqueeze(1) # shape: [batch_size, 1, segment_size]
             optimizer_d.zero_grad()
             
@@ -1,31 +1,10 @@
+import functools
+
 import torch
 from torch import Tensor
 import torch.nn as nn
 import torchaudio
 
-class LinearSpectrogram(nn.Module):
-    def __init__(self, n_fft, win_length, hop_length, pad, center, pad_mode):
-        super().__init__()
-
-        self.n_fft = n_fft
-        self.win_length = win_length
-        self.hop_length = hop_length
-        self.pad = pad
-        self.center = center
-        self.pad_mode = pad_mode
-        
-        self.register_buffer("window", torch.hann_window(win_length))
-
-    def forward(self, waveform: Tensor) -> Tensor:
-        if waveform.ndim == 3:
-            waveform = waveform.squeeze(1)
-        waveform = torch.nn.functional.pad(waveform.unsqueeze(1), (self.pad, self.pad), self.pad_mode).squeeze(1)
-        spec = torch.stft(waveform, self.n_fft, self.hop_length, self.win_length, self.window, self.center, self.pad_mode, False, True, True)
-        spec = torch.view_as_real(spec)
-        spec = torch.sqrt(spec.pow(2).sum(-1) + 1e-6)
-        return spec
-
-
 class LogMelSpectrogram(nn.Module):
     def __init__(self, sample_rate, n_fft, win_length, hop_length, f_min, f_max, pad, n_mels, center, pad_mode, mel_scale):
         super().__init__()
@@ -40,9 +19,13 @@ class LogMelSpectrogram(nn.Module):
         self.center = center
         self.pad_mode = pad_mode
         self.mel_scale = mel_scale
-        
-        self.spectrogram = LinearSpectrogram(n_fft, win_length, hop_length, pad, center, pad_mode)
-        self.mel_scale = torchaudio.transforms.MelScale(n_mels, sample_rate, f_min, f_max, (n_fft//2)+1, mel_scale, mel_scale)
+
+        # derived from config, so neither buffer belongs in checkpoints
+        # (and DDP then skips broadcasting them at init)
+        self.register_buffer("window", torch.hann_window(win_length), persistent=False)
+        # precomputed filterbank: one matmul per call instead of going
+        # through a MelScale submodule
+        self.register_buffer("fb", torchaudio.functional.melscale_fbanks((n_fft // 2) + 1, f_min, f_max, n_mels, sample_rate, mel_scale, mel_scale), persistent=False)
 
     def compress(self, x: Tensor) -> Tensor:
         return torch.log(torch.clamp(x, min=1e-5))
@@ -51,10 +34,17 @@ class LogMelSpectrogram(nn.Module):
         return torch.exp(x)
 
     def forward(self, x: Tensor) -> Tensor:
-        linear_spec = self.spectrogram(x)
-        x = self.mel_scale(linear_spec)
-        x = self.compress(x)
-        return x
+        if x.ndim == 3:
+            x = x.squeeze(1)
+        # reflect pad1d takes [B, T] directly, no need to bounce through 3D
+        x = torch.nn.functional.pad(x, (self.pad, self.pad), self.pad_mode)
+        spec = torch.view_as_real(torch.stft(x, self.n_fft, self.hop_length, self.win_length, self.window, self.center, self.pad_mode, False, True, True))
+        # amplitude has to be taken before the mel matmul: the filterbank
+        # mixes bins, so folding the sqrt into the log would change the
+        # feature definition (and invalidate existing mels/checkpoints)
+        spec = torch.sqrt(spec[..., 0].square() + spec[..., 1].square() + 1e-6)
+        mel = torch.matmul(self.fb.transpose(-1, -2), spec)
+        return self.compress(mel)
     
 def load_and_resample_audio(audio_path, target_sr, device='cpu') -> Tensor:
     try:
@@ -70,5 +60,13 @@ def load_and_resample_audio(audio_path, target_sr, device='cpu') -> Tensor:
         
     # resample audio to target sample_rate
     if sr != target_sr:
-        y = torchaudio.functional.resample(y, sr, target_sr)
-    return y
\ No newline at end of file
+        y = _resampler(int(sr), int(target_sr)).to(y.device)(y)
+    return y
+
+
+@functools.lru_cache(maxsize=None)
+def _resampler(orig_sr: int, target_sr: int) -> torchaudio.transforms.Resample:
+    """One Resample transform per (src, dst) rate pair — the sinc kernel is
+    precomputed once instead of being rebuilt on every call like
+    torchaudio.functional.resample does."""
+    return torchaudio.transforms.Resample(orig_sr, target_sr)
\ No newline at end of file